@@ -0,0 +1,104 @@
+"""
+Shared PyAudio access for the microphone tools
+"""
+
+import atexit
+import time
+from collections import namedtuple
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+import pyaudio
+import speech_recognition as sr
+
+InputDevice = namedtuple('InputDevice', 'index name channels sample_rate low_input_latency is_default')
+
+# Last input device enumeration and when it was taken (time.monotonic())
+_DEVICE_CACHE = {"ts": 0.0, "devices": None}
+
+@lru_cache(maxsize=1)
+def get_pyaudio() -> pyaudio.PyAudio:
+    """Get the shared PyAudio instance (PortAudio is initialized once per process)"""
+    p = pyaudio.PyAudio()
+    atexit.register(p.terminate)
+    return p
+
+@lru_cache(maxsize=1)
+def get_default_input_device() -> Optional[dict]:
+    """Get the default input device info, or None if there is no default input"""
+    try:
+        return get_pyaudio().get_default_input_device_info()
+    except IOError:
+        return None
+
+def get_device_info(device_index: Optional[int] = None) -> Optional[dict]:
+    """Get info for a device index, or the default input device for None"""
+    if device_index is None:
+        return get_default_input_device()
+    return get_pyaudio().get_device_info_by_index(device_index)
+
+def iter_input_devices() -> Iterator[InputDevice]:
+    """Yield the audio input devices (microphones) known to PortAudio"""
+    p = get_pyaudio()
+    default_device = get_default_input_device()
+    default_index = default_device['index'] if default_device else None
+
+    get_device_info_by_index = p.get_device_info_by_index
+    for i in range(p.get_device_count()):
+        device_info = get_device_info_by_index(i)
+        channels = device_info['maxInputChannels']
+        if channels > 0:
+            yield InputDevice(i, device_info['name'], channels, int(device_info['defaultSampleRate']),
+                              device_info['defaultLowInputLatency'], i == default_index)
+
+class _SharedPyAudio:
+    """Stand-in for a PyAudio instance that delegates to the shared one and never terminates it"""
+
+    def __getattr__(self, name):
+        return getattr(get_pyaudio(), name)
+
+    def terminate(self):
+        pass
+
+class _SharedPyAudioModule:
+    """Stand-in for the pyaudio module whose PyAudio() hands out the shared instance"""
+
+    def __getattr__(self, name):
+        return getattr(pyaudio, name)
+
+    @staticmethod
+    def PyAudio():
+        return _SharedPyAudio()
+
+_SHARED_PYAUDIO_MODULE = _SharedPyAudioModule()
+
+class SharedMicrophone(sr.Microphone):
+    """sr.Microphone that opens streams on the shared PyAudio instance
+
+    sr.Microphone initializes and terminates PortAudio on construction and on
+    every 'with' block; this reuses get_pyaudio() instead.
+    """
+
+    @staticmethod
+    def get_pyaudio():
+        return _SHARED_PYAUDIO_MODULE
+
+def list_input_devices(ttl: float = 5.0) -> Tuple[InputDevice, ...]:
+    """Get the input devices, reusing an enumeration taken less than ttl seconds ago"""
+    now = time.monotonic()
+    if _DEVICE_CACHE["devices"] is None or now - _DEVICE_CACHE["ts"] >= ttl:
+        _DEVICE_CACHE["devices"] = tuple(iter_input_devices())
+        _DEVICE_CACHE["ts"] = now
+    return _DEVICE_CACHE["devices"]
+
+def invalidate_device_cache():
+    """Forget cached device info so newly connected devices are picked up"""
+    _DEVICE_CACHE["devices"] = None
+    get_default_input_device.cache_clear()
+
+    # PortAudio only re-scans devices when it is re-initialized
+    if get_pyaudio.cache_info().currsize:
+        p = get_pyaudio()
+        atexit.unregister(p.terminate)
+        p.terminate()
+        get_pyaudio.cache_clear()
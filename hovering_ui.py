@@ -1,25 +1,66 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
+import tkinter.font as tkfont
 import threading
 import queue
 import time
 from typing import Optional, Callable
 import asyncio
+import builtins
+import logging
+import re
+import textwrap
 from language_utils import get_language_manager, get_text
 
 class HoveringUI:
     """A transparent hovering UI that displays terminal output above the browser"""
     
+    # Separator line drawn around agent step messages
+    _SEP = "═" * 50 + "\n"
+    
+    # Width of the "[HH:MM:SS] " prefix on every message line
+    _TIMESTAMP_WIDTH = len("[00:00:00] ")
+    
+    # Milliseconds to wait after the first queued message so a burst renders in one pass
+    DRAIN_DELAY_MS = 50
+    
+    # Virtual event other threads post to wake the Tk thread
+    _DRAIN_EVENT = '<<B4ADrain>>'
+    
     def __init__(self, width: int = 400, height: int = 300, opacity: float = 0.85, language: Optional[str] = None):
         self.width = width
         self.height = height
         self.opacity = opacity
         self.root: Optional[tk.Tk] = None
         self.text_widget: Optional[scrolledtext.ScrolledText] = None
-        self.message_queue = queue.Queue()
+        self.message_queue = queue.SimpleQueue()
         self.is_running = False
         self.ui_thread: Optional[threading.Thread] = None
         
+        # Set once the Tk thread is about to enter its main loop
+        self._ready = threading.Event()
+        self._tk_thread_id: Optional[int] = None
+        
+        # Set when the queue goes non-empty, cleared when the Tk thread drains it
+        self._pending = False
+        
+        # flush() callers waiting for the next drain
+        self._flush_waiters = []
+        
+        # Last formatted timestamp second, reused for messages in the same second
+        self._last_ts_int = -1
+        self._last_ts_str = ""
+        
+        # Minimized state, and messages skipped while minimized under backlog
+        self.is_minimized = False
+        self._dropped = 0
+        
+        # Message wrap width in characters, measured once the text widget exists
+        self._wrap_width = 0
+        
+        # Lines currently in the text widget, tracked to avoid reading the buffer back
+        self._line_count = 0
+        
         # Language support
         self.language_manager = get_language_manager()
         if language:
@@ -34,28 +75,64 @@ class HoveringUI:
         self.ui_thread = threading.Thread(target=self._run_ui, daemon=True)
         self.ui_thread.start()
         
-        # Give the UI time to initialize
-        time.sleep(0.5)
+        # Wait for the UI to initialize
+        self._ready.wait(timeout=2.0)
+    
+    def flush(self, timeout: float = 1.0):
+        """Render all queued messages, waiting until the Tk thread has drawn them"""
+        if not self.root or not self.is_running:
+            return
+        
+        if threading.get_ident() == self._tk_thread_id:
+            self._drain_once()
+            return
+        
+        # Only the Tk thread touches Tk; wake it to drain and wait for it
+        drained = threading.Event()
+        self._flush_waiters.append(drained)
+        self._pending = True
+        self._wake()
+        drained.wait(timeout)
     
     def stop(self):
         """Stop the hovering UI"""
         self.is_running = False
-        if self.root:
-            self.root.after(0, self.root.quit)
+        self._wake()
+    
+    def _wake(self):
+        """Post the drain event to the Tk thread (safe from any thread once Tk is running)"""
+        if not self._ready.is_set():
+            return  # the first drain after startup picks up anything queued until now
+        try:
+            self.root.event_generate(self._DRAIN_EVENT, when='tail')
+        except (tk.TclError, RuntimeError):
+            pass  # window already closed
     
     def add_message(self, message: str, message_type: str = "info"):
         """Add a message to be displayed in the UI"""
         if self.is_running:
+            # Nobody is watching a minimized window; don't let a backlog grow unbounded
+            if self.is_minimized and self.message_queue.qsize() > 500:
+                self._dropped += 1
+                return
+            
+            # Wake the Tk thread only when the queue goes from empty to non-empty;
+            # the drain then renders everything queued by the time it runs
             self.message_queue.put((message, message_type, time.time()))
+            if not self._pending:
+                self._pending = True
+                self._wake()
     
     def _run_ui(self):
         """Run the UI in the main thread"""
+        self._tk_thread_id = threading.get_ident()
         self.root = tk.Tk()
         self._setup_window()
         self._create_widgets()
         self._start_message_processor()
         
         try:
+            self._ready.set()
             self.root.mainloop()
         except Exception as e:
             print(f"UI Error: {e}")
@@ -89,21 +166,46 @@ class HoveringUI:
     def _make_draggable(self):
         """Make the window draggable"""
         def start_move(event):
-            self.root.x = event.x
-            self.root.y = event.y
+            # Read the window position once per drag; motion events only add deltas
+            self._win_x = self.root.winfo_x()
+            self._win_y = self.root.winfo_y()
+            self._grab_x = event.x_root
+            self._grab_y = event.y_root
+            self._last_move = 0.0
         
         def on_move(event):
-            deltax = event.x - self.root.x
-            deltay = event.y - self.root.y
-            x = self.root.winfo_x() + deltax
-            y = self.root.winfo_y() + deltay
+            # Coalesce motion events to roughly one geometry update per frame
+            now = time.perf_counter()
+            if now - self._last_move < 0.016:
+                return
+            self._last_move = now
+            move_to(event)
+        
+        def move_to(event):
+            x = self._win_x + event.x_root - self._grab_x
+            y = self._win_y + event.y_root - self._grab_y
             self.root.geometry(f"+{x}+{y}")
         
         self.root.bind('<Button-1>', start_move)
         self.root.bind('<B1-Motion>', on_move)
+        # Always land on the final pointer position, even if the last motion was coalesced
+        self.root.bind('<ButtonRelease-1>', move_to)
+    
+    def _create_fonts(self):
+        """Create the named fonts shared by all widgets and text tags"""
+        self._fonts = [
+            tkfont.Font(self.root, name='b4a-title', family='Segoe UI', size=9, weight='bold'),
+            tkfont.Font(self.root, name='b4a-close', family='Segoe UI', size=12, weight='bold'),
+            tkfont.Font(self.root, name='b4a-button', family='Segoe UI', size=10, weight='bold'),
+            tkfont.Font(self.root, name='b4a-code', family='Consolas', size=9),
+            tkfont.Font(self.root, name='b4a-code-b', family='Consolas', size=9, weight='bold'),
+            tkfont.Font(self.root, name='b4a-code-small', family='Consolas', size=8)
+        ]
     
     def _create_widgets(self):
         """Create the UI widgets"""
+        self._create_fonts()
+        
         # Main frame
         main_frame = tk.Frame(self.root, bg='#1e1e1e', relief='solid', bd=1)
         main_frame.pack(fill='both', expand=True, padx=2, pady=2)
@@ -119,7 +221,7 @@ class HoveringUI:
             text=get_text("ui.title"), 
             bg='#2d2d2d', 
             fg='white',
-            font=('Segoe UI', 9, 'bold')
+            font='b4a-title'
         )
         title_label.pack(side='left', padx=10, pady=5)
         
@@ -129,7 +231,7 @@ class HoveringUI:
             text="×",
             bg='#ff4444',
             fg='white',
-            font=('Segoe UI', 12, 'bold'),
+            font='b4a-close',
             bd=0,
             width=3,
             command=self.stop
@@ -142,7 +244,7 @@ class HoveringUI:
             text="–",
             bg='#666666',
             fg='white',
-            font=('Segoe UI', 10, 'bold'),
+            font='b4a-button',
             bd=0,
             width=3,
             command=self._toggle_minimize
@@ -157,14 +259,25 @@ class HoveringUI:
             text_frame,
             bg='#1e1e1e',
             fg='#ffffff',
-            font=('Consolas', 9),
-            wrap='word',
+            font='b4a-code',
+            wrap='none',
+            undo=False,
             bd=0,
             padx=10,
             pady=5
         )
+        
+        # Lines are pre-wrapped in Python, so Tk never has to reflow; the
+        # horizontal scrollbar covers anything that still overflows
+        x_scrollbar = tk.Scrollbar(text_frame, orient='horizontal', command=self.text_widget.xview)
+        self.text_widget.configure(xscrollcommand=x_scrollbar.set)
+        x_scrollbar.pack(side='bottom', fill='x')
         self.text_widget.pack(fill='both', expand=True)
         
+        # Characters per line for the monospace font, minus padding and timestamp prefix
+        char_width = tkfont.nametofont('b4a-code', self.root).measure('M')
+        self._wrap_width = max(20, (self.width - 40) // max(char_width, 1) - self._TIMESTAMP_WIDTH)
+        
         # Configure text tags for different message types
         self.text_widget.tag_configure('info', foreground='#ffffff')
         self.text_widget.tag_configure('success', foreground='#4ade80')
@@ -172,13 +285,12 @@ class HoveringUI:
         self.text_widget.tag_configure('error', foreground='#ef4444')
         self.text_widget.tag_configure('question', foreground='#60a5fa')
         self.text_widget.tag_configure('response', foreground='#a78bfa')
-        self.text_widget.tag_configure('timestamp', foreground='#6b7280', font=('Consolas', 8))
+        self.text_widget.tag_configure('timestamp', foreground='#6b7280', font='b4a-code-small')
         # New tags for agent activity
-        self.text_widget.tag_configure('goal', foreground='#fbbf24', font=('Consolas', 9, 'bold'))  # Yellow bold for goals
-        self.text_widget.tag_configure('action', foreground='#06d6a0', font=('Consolas', 9, 'bold'))  # Teal bold for actions
-        self.text_widget.tag_configure('step', foreground='#8b5cf6', font=('Consolas', 9, 'bold'))  # Purple bold for steps
+        self.text_widget.tag_configure('goal', foreground='#fbbf24', font='b4a-code-b')  # Yellow bold for goals
+        self.text_widget.tag_configure('action', foreground='#06d6a0', font='b4a-code-b')  # Teal bold for actions
+        self.text_widget.tag_configure('step', foreground='#8b5cf6', font='b4a-code-b')  # Purple bold for steps
         
-        self.is_minimized = False
         self.normal_height = self.height
     
     def _toggle_minimize(self):
@@ -186,119 +298,225 @@ class HoveringUI:
         if self.is_minimized:
             self.root.geometry(f"{self.width}x{self.normal_height}")
             self.is_minimized = False
+            
+            if self._dropped:
+                self.add_message(get_text("ui.messages_dropped", count=self._dropped), "info")
+                self._dropped = 0
         else:
             self.root.geometry(f"{self.width}x50")
             self.is_minimized = True
     
     def _start_message_processor(self):
         """Start processing messages from the queue"""
-        self._process_messages()
+        self.root.bind(self._DRAIN_EVENT, self._on_drain_event)
+        
+        # Flush anything queued before the window existed, once the main loop runs
+        self.root.after_idle(self._drain_once)
     
-    def _process_messages(self):
+    def _on_drain_event(self, event):
+        """Handle a wake-up from another thread on the Tk thread"""
+        if not self.is_running:
+            self.root.quit()
+        elif self._flush_waiters:
+            self._drain_once()
+        else:
+            self.root.after(self.DRAIN_DELAY_MS, self._drain_once)
+    
+    def _drain_once(self):
         """Process messages from the queue and display them"""
+        self._pending = False
+        
+        # Drain everything queued since the last tick so bursts render in one pass
+        messages = []
+        append = messages.append
+        get = self.message_queue.get_nowait
         try:
-            while not self.message_queue.empty():
-                message, msg_type, timestamp = self.message_queue.get_nowait()
-                self._display_message(message, msg_type, timestamp)
+            while True:
+                append(get())
         except queue.Empty:
             pass
         
-        if self.is_running:
-            self.root.after(100, self._process_messages)
+        if messages:
+            self._display_messages(messages)
+        
+        # Everything queued before these flush() calls is now drawn
+        while self._flush_waiters:
+            self._flush_waiters.pop().set()
     
-    def _display_message(self, message: str, msg_type: str, timestamp: float):
-        """Display a message in the text widget"""
+    def _display_messages(self, messages):
+        """Display a batch of messages with one plain insert and one tag_add per tag"""
         if not self.text_widget:
             return
         
-        # Format timestamp
-        time_str = time.strftime("%H:%M:%S", time.localtime(timestamp))
-        
-        # Insert timestamp
-        self.text_widget.insert('end', f"[{time_str}] ", 'timestamp')
+        # Compute tag ranges from the tracked line count instead of letting Tk
+        # resolve a tag per inserted chunk. Only the ASCII timestamp prefix ends
+        # mid-line, so its length is a safe Tk column offset.
+        texts = []
+        ranges = {}
+        line, col = self._line_count + 1, 0
+        for message, msg_type, timestamp in messages:
+            for text, tag in self._format_message(message, msg_type, timestamp):
+                start = f"{line}.{col}"
+                newlines = text.count('\n')
+                if newlines:
+                    line += newlines
+                    col = 0
+                else:
+                    col += len(text)
+                ranges.setdefault(tag, []).extend((start, f"{line}.{col}"))
+                texts.append(text)
         
-        # Special formatting for agent activity
-        if msg_type in ['goal', 'action', 'step']:
-            # Add some visual separation for important agent messages
-            if msg_type == 'step':
-                self.text_widget.insert('end', "═" * 50 + "\n", 'timestamp')
-                self.text_widget.insert('end', f"[{time_str}] ", 'timestamp')
-            
-            # Insert message with appropriate styling
-            self.text_widget.insert('end', f"{message}\n", msg_type)
-            
-            if msg_type == 'step':
-                self.text_widget.insert('end', "═" * 50 + "\n", 'timestamp')
-        else:
-            # Insert message with appropriate styling
-            self.text_widget.insert('end', f"{message}\n", msg_type)
+        self.text_widget.insert('end', ''.join(texts))
+        for tag, indices in ranges.items():
+            self.text_widget.tag_add(tag, *indices)
+        self._line_count = line - 1
         
         # Auto-scroll to bottom
         self.text_widget.see('end')
         
         # Limit text widget content to prevent memory issues
-        lines = self.text_widget.get('1.0', 'end').count('\n')
-        if lines > 1000:
-            self.text_widget.delete('1.0', '100.0')
+        if self._line_count > 1200:
+            self.text_widget.delete('1.0', '201.0')
+            self._line_count -= 200
+    
+    def _format_message(self, message: str, msg_type: str, timestamp: float) -> list:
+        """Build the (text, tag) segments for one message"""
+        # Format timestamp (only once per wall-clock second)
+        ts_int = int(timestamp)
+        if ts_int != self._last_ts_int:
+            self._last_ts_str = time.strftime("%H:%M:%S", time.localtime(ts_int))
+            self._last_ts_int = ts_int
+        time_str = self._last_ts_str
+        
+        # Wrap long lines once here rather than having Tk reflow on every insert
+        if self._wrap_width and len(message) > self._wrap_width:
+            message = '\n'.join(
+                textwrap.fill(line, self._wrap_width) if len(line) > self._wrap_width else line
+                for line in message.split('\n')
+            )
+        
+        prefix = (f"[{time_str}] ", 'timestamp')
+        
+        # Special formatting for agent activity
+        if msg_type == 'step':
+            # Add some visual separation for important agent messages
+            sep = (self._SEP, 'timestamp')
+            return [prefix, sep, prefix, (f"{message}\n", msg_type), sep]
+        
+        # Insert message with appropriate styling
+        return [prefix, (f"{message}\n", msg_type)]
+
+# Message classifier: alternatives are tried in priority order, each as a
+# lookahead over the whole message, so one search replaces the chained scans
+_MESSAGE_TYPE_PATTERN = re.compile(
+    r"^(?:"
+    r"(?=.*?(?P<goal>🎯 next goal:))"
+    r"|(?=.*?(?P<action>🦾 \[action))(?=.*\])"
+    r"|(?=.*?(?P<step>📍 step))"
+    r"|(?=.*?(?P<question>🤔|❓))"
+    r"|(?=.*?(?P<success>✅|🎯|📝))"
+    r"|(?=.*?(?P<warning>⚠️|🔊))"
+    r"|(?=.*?(?P<error>❌|⏹️))"
+    r"|(?=.*?(?P<response>received:|response:))"
+    r")",
+    re.IGNORECASE | re.DOTALL
+)
+
+def _classify_message(message: str) -> str:
+    """Determine message type based on content"""
+    match = _MESSAGE_TYPE_PATTERN.match(message)
+    return match.lastgroup if match else 'info'
 
 class UIMessageHandler:
     """Handler to capture and route print statements to the UI"""
     
-    def __init__(self, ui: HoveringUI):
+    def __init__(self, ui: HoveringUI, original_print: Callable = print):
         self.ui = ui
-        self.original_print = print
+        self.original_print = original_print
+        self._add_message = ui.add_message
     
     def enhanced_print(self, *args, **kwargs):
         """Enhanced print function that also sends to UI"""
         # Call original print
         self.original_print(*args, **kwargs)
         
-        # Extract message and determine type
-        message = ' '.join(str(arg) for arg in args)
+        # Extract message and determine type (most calls pass a single string)
+        if len(args) == 1 and type(args[0]) is str:
+            message = args[0]
+        else:
+            message = ' '.join(str(arg) for arg in args)
         msg_type = self._determine_message_type(message)
         
         # Send to UI
-        self.ui.add_message(message, msg_type)
+        self._add_message(message, msg_type)
     
     def _determine_message_type(self, message: str) -> str:
         """Determine message type based on content"""
-        message_lower = message.lower()
-        
-        # Check for agent activity patterns first (more specific)
-        if '🎯 next goal:' in message_lower:
-            return 'goal'
-        elif '🦾 [action' in message_lower and ']' in message:
-            return 'action'
-        elif '📍 step' in message_lower:
-            return 'step'
-        elif any(emoji in message for emoji in ['🤔', '❓']):
-            return 'question'
-        elif any(emoji in message for emoji in ['✅', '🎯', '📝']):
-            return 'success'
-        elif any(emoji in message for emoji in ['⚠️', '🔊']):
-            return 'warning'
-        elif any(emoji in message for emoji in ['❌', '⏹️']):
-            return 'error'
-        elif 'received:' in message_lower or 'response:' in message_lower:
-            return 'response'
-        else:
-            return 'info'
+        return _classify_message(message)
+
+class UILogHandler(logging.Handler):
+    """Logging handler that routes log records to the UI"""
+    
+    # Map warning and error levels onto the UI's text tags; lower levels are
+    # styled by content, like printed messages
+    LEVEL_TAGS = {
+        'WARNING': 'warning',
+        'ERROR': 'error',
+        'CRITICAL': 'error'
+    }
+    
+    def __init__(self, ui: HoveringUI, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.ui = ui
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            message = self.format(record)
+            msg_type = self.LEVEL_TAGS.get(record.levelname) or _classify_message(message)
+            self.ui.add_message(message, msg_type)
+        except Exception:
+            self.handleError(record)
 
 # Global UI instance
 _ui_instance: Optional[HoveringUI] = None
 _message_handler: Optional[UIMessageHandler] = None
+_log_handler: Optional[UILogHandler] = None
 
-def initialize_ui(width: int = 450, height: int = 350, opacity: float = 0.85, language: Optional[str] = None):
-    """Initialize the hovering UI"""
-    global _ui_instance, _message_handler
+# True while print output should be mirrored to the UI
+_ui_active = False
+_original_print = builtins.print
+
+def shim_print(*args, **kwargs):
+    """print() replacement that only does UI formatting work while the UI is active"""
+    if _ui_active and _message_handler:
+        _message_handler.enhanced_print(*args, **kwargs)
+    else:
+        _original_print(*args, **kwargs)
+
+def initialize_ui(width: int = 450, height: int = 350, opacity: float = 0.85, language: Optional[str] = None,
+                  patch_print: bool = False):
+    """
+    Initialize the hovering UI
+    
+    Log records are always routed to the UI through a logging handler.
+    
+    Args:
+        patch_print: Also replace builtins.print so plain print() output reaches the UI
+    """
+    global _ui_instance, _message_handler, _log_handler, _ui_active
     
     if _ui_instance is None:
         _ui_instance = HoveringUI(width, height, opacity, language)
-        _message_handler = UIMessageHandler(_ui_instance)
+        _message_handler = UIMessageHandler(_ui_instance, _original_print)
         
-        # Replace the global print function
-        import builtins
-        builtins.print = _message_handler.enhanced_print
+        # Route log records to the UI
+        _log_handler = UILogHandler(_ui_instance)
+        logging.getLogger().addHandler(_log_handler)
+        
+        # Optionally replace the global print function
+        if patch_print:
+            builtins.print = shim_print
+        _ui_active = True
         
         # Start the UI
         _ui_instance.start()
@@ -310,18 +528,24 @@ def initialize_ui(width: int = 450, height: int = 350, opacity: float = 0.85, la
 
 def shutdown_ui():
     """Shutdown the hovering UI"""
-    global _ui_instance, _message_handler
+    global _ui_instance, _message_handler, _log_handler, _ui_active
     
     if _ui_instance:
         _ui_instance.add_message(get_text("ui.shutting_down"), "info")
-        time.sleep(0.5)
+        _ui_instance.flush()
         _ui_instance.stop()
         _ui_instance = None
     
+    _ui_active = False
+    
+    if _log_handler:
+        logging.getLogger().removeHandler(_log_handler)
+        _log_handler = None
+    
     if _message_handler:
         # Restore original print function
-        import builtins
-        builtins.print = _message_handler.original_print
+        if builtins.print is shim_print:
+            builtins.print = _message_handler.original_print
         _message_handler = None
 
 def get_ui() -> Optional[HoveringUI]:
@@ -4,6 +4,9 @@ Language detection and management utilities for Browser4All
 import json
 import locale
 import os
+import pickle
+import re
+from functools import lru_cache
 from typing import Dict, Optional, Any
 from pathlib import Path
 
@@ -41,12 +44,53 @@ SUPPORTED_LANGUAGES = {
     }
 }
 
+# Reverse index of hyphenated locale codes (e.g. 'es-MX') to language codes
+_LOCALE_INDEX = {
+    locale_code.replace('_', '-'): lang
+    for lang, config in SUPPORTED_LANGUAGES.items()
+    for locale_code in config['locale_codes']
+}
+
+# Simple keyword-based detection
+LANGUAGE_KEYWORDS = {
+    'es': ['hola', 'gracias', 'por favor', 'sí', 'no', 'que', 'como', 'donde'],
+    'fr': ['bonjour', 'merci', 'oui', 'non', 'que', 'comment', 'où', 's\'il vous plaît'],
+    'de': ['hallo', 'danke', 'bitte', 'ja', 'nein', 'wie', 'was', 'wo'],
+    'zh': ['你好', '谢谢', '请', '是', '不', '什么', '怎么', '哪里']
+}
+
+# One pattern per language, scored independently so keywords shared or nested
+# across languages ('no'/'non', 'que') count for each. The lookahead finds a match
+# at every position, so overlapping keywords are all seen, like substring checks.
+_LANGUAGE_KEYWORD_PATTERNS = {
+    lang: re.compile(f"(?=({'|'.join(re.escape(keyword) for keyword in keywords)}))", re.IGNORECASE)
+    for lang, keywords in LANGUAGE_KEYWORDS.items()
+}
+
+def _flatten(data: Dict[str, Any], prefix: str = '') -> Dict[str, str]:
+    """Flatten nested translation dicts into dotted keys (e.g. 'ui.title')"""
+    flat = {}
+    for key, value in data.items():
+        key_path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{key_path}."))
+        else:
+            flat[key_path] = str(value)
+    return flat
+
+@lru_cache(maxsize=512)
+def _format_cached(text: str, kwargs_items: frozenset) -> str:
+    """Format text with hashable kwargs, memoizing repeated lookups"""
+    return text.format(**dict(kwargs_items))
+
 class LanguageManager:
     """Manages language detection, loading, and switching"""
     
     def __init__(self, language: Optional[str] = None):
         self.current_language = language or self.detect_system_language()
         self.translations = {}
+        self._flat = {}
+        self._static_text = {}  # key_path -> resolved text for calls without kwargs
         self.translations_dir = Path(__file__).parent / 'translations'
         self._load_translations()
     
@@ -64,9 +108,9 @@ class LanguageManager:
                     return lang_code
                     
                 # Check locale-specific matches
-                for lang, config in SUPPORTED_LANGUAGES.items():
-                    if any(system_locale.startswith(lc.replace('_', '-')) for lc in config['locale_codes']):
-                        return lang
+                lang = _LOCALE_INDEX.get(system_locale[:5])
+                if lang:
+                    return lang
         except Exception:
             pass
         
@@ -74,18 +118,60 @@ class LanguageManager:
         return 'en'
     
     def _load_translations(self):
-        """Load translation files for all supported languages"""
-        for lang_code in SUPPORTED_LANGUAGES.keys():
-            translation_file = self.translations_dir / f'{lang_code}.json'
-            if translation_file.exists():
-                try:
-                    with open(translation_file, 'r', encoding='utf-8') as f:
-                        self.translations[lang_code] = json.load(f)
-                except Exception as e:
-                    print(f"Warning: Failed to load {lang_code} translations: {e}")
-                    # Fallback to English if available
-                    if lang_code != 'en' and 'en' in self.translations:
-                        self.translations[lang_code] = self.translations['en']
+        """Load English (the fallback) and the current language; others load on demand"""
+        self._load_one('en')
+        self._load_one(self.current_language)
+    
+    def _load_one(self, lang_code: str):
+        """Load one language's translations, preferring its packed cache"""
+        if lang_code in self._flat:
+            return
+        
+        translation_file = self.translations_dir / f'{lang_code}.json'
+        if not translation_file.exists():
+            return
+        
+        cache_file = translation_file.with_suffix('.pkl')
+        if self._is_cache_fresh(cache_file, translation_file):
+            try:
+                with open(cache_file, 'rb') as f:
+                    self.translations[lang_code], self._flat[lang_code] = pickle.load(f)
+                return
+            except Exception as e:
+                print(f"Warning: Failed to load {lang_code} translation cache: {e}")
+        
+        try:
+            with open(translation_file, 'r', encoding='utf-8') as f:
+                self.translations[lang_code] = json.load(f)
+            self._flat[lang_code] = _flatten(self.translations[lang_code])
+        except Exception as e:
+            print(f"Warning: Failed to load {lang_code} translations: {e}")
+            # Fallback to English if available
+            if lang_code != 'en' and 'en' in self.translations:
+                self.translations[lang_code] = self.translations['en']
+                self._flat[lang_code] = self._flat['en']
+            return
+        
+        self._write_translation_cache(cache_file, lang_code)
+    
+    def _is_cache_fresh(self, cache_file: Path, translation_file: Path) -> bool:
+        """Check the packed cache exists and is newer than its JSON source file"""
+        try:
+            return cache_file.stat().st_mtime >= translation_file.stat().st_mtime
+        except OSError:
+            return False
+    
+    def _write_translation_cache(self, cache_file: Path, lang_code: str):
+        """Pack one language's translations into a pickle (the JSON file stays the source of truth)"""
+        tmp_file = cache_file.with_suffix('.tmp')
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump((self.translations[lang_code], self._flat[lang_code]), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            # Read-only installs just skip the cache
+            pass
     
     def get_text(self, key_path: str, **kwargs) -> str:
         """
@@ -95,6 +181,16 @@ class LanguageManager:
             key_path: Dot-separated path to the text (e.g., 'ui.title', 'agent.greeting')
             **kwargs: Variables to format into the text
         """
+        if not kwargs:
+            text = self._static_text.get(key_path)
+            if text is None:
+                text = self._static_text[key_path] = self._format_text(self._resolve_text(key_path), kwargs)
+            return text
+        
+        return self._format_text(self._resolve_text(key_path), kwargs)
+    
+    def _resolve_text(self, key_path: str) -> str:
+        """Find the raw text for a key, falling back to English and then the key itself"""
         # Try current language first
         text = self._get_text_from_lang(self.current_language, key_path)
         
@@ -106,26 +202,24 @@ class LanguageManager:
         if text is None:
             text = key_path
         
-        # Format with provided variables
+        return text
+    
+    def _format_text(self, text: str, kwargs: Dict[str, Any]) -> str:
+        """Format text with the provided variables"""
         try:
-            return text.format(**kwargs)
+            if not kwargs:
+                return text.format()
+            try:
+                return _format_cached(text, frozenset(kwargs.items()))
+            except TypeError:
+                # Unhashable values can't be memoized
+                return text.format(**kwargs)
         except (KeyError, ValueError):
             return text
     
     def _get_text_from_lang(self, lang_code: str, key_path: str) -> Optional[str]:
         """Get text from a specific language's translations"""
-        if lang_code not in self.translations:
-            return None
-            
-        keys = key_path.split('.')
-        data = self.translations[lang_code]
-        
-        try:
-            for key in keys:
-                data = data[key]
-            return str(data)
-        except (KeyError, TypeError):
-            return None
+        return self._flat.get(lang_code, {}).get(key_path)
     
     def set_language(self, language: str) -> bool:
         """
@@ -135,7 +229,9 @@ class LanguageManager:
             bool: True if successful, False if language not supported
         """
         if language in SUPPORTED_LANGUAGES:
+            self._load_one(language)
             self.current_language = language
+            self._static_text.clear()
             return True
         return False
     
@@ -164,20 +260,10 @@ class LanguageManager:
         Note: This is a simple heuristic-based detection
         For production use, consider using langdetect library
         """
-        text_lower = text.lower()
-        
-        # Simple keyword-based detection
-        language_keywords = {
-            'es': ['hola', 'gracias', 'por favor', 'sí', 'no', 'que', 'como', 'donde'],
-            'fr': ['bonjour', 'merci', 'oui', 'non', 'que', 'comment', 'où', 's\'il vous plaît'],
-            'de': ['hallo', 'danke', 'bitte', 'ja', 'nein', 'wie', 'was', 'wo'],
-            'zh': ['你好', '谢谢', '请', '是', '不', '什么', '怎么', '哪里']
-        }
-        
-        # Count keyword matches for each language
+        # Score each language by how many distinct keywords appear
         scores = {}
-        for lang, keywords in language_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
+        for lang, pattern in _LANGUAGE_KEYWORD_PATTERNS.items():
+            score = len({keyword.lower() for keyword in pattern.findall(text)})
             if score > 0:
                 scores[lang] = score
         
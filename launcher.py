@@ -122,23 +122,22 @@ class Browser4AllLauncher:
                 return
             
             # Prepare command based on language selection
-            if selected_lang_code == 'auto':
-                # No language argument for auto-detect
-                cmd = ['python', 'main.py']
-            else:
-                # Add language argument
-                cmd = ['python', 'main.py', '--language', selected_lang_code]
+            cmd = [sys.executable, 'main.py']
+            if selected_lang_code != 'auto':
+                # Add language argument (none for auto-detect)
+                cmd += ['--language', selected_lang_code]
             
-            # Launch in PowerShell with the correct directory
-            powershell_cmd = f'cd "{target_dir}"; {" ".join(cmd)}'
+            if os.name == 'nt':
+                # Keep the console open if main.py fails so its traceback can be read;
+                # cmd /c strips the outer quotes, leaving the quoted command line intact
+                cmd = f'cmd /c "{subprocess.list2cmdline(cmd)} || pause"'
             
-            # Open new PowerShell window and run the command
-            subprocess.Popen([
-                'powershell', 
-                '-NoExit',  # Keep window open after execution
-                '-Command', 
-                powershell_cmd
-            ], cwd=target_dir)
+            # Launch in its own console window
+            subprocess.Popen(
+                cmd,
+                cwd=target_dir,
+                creationflags=getattr(subprocess, 'CREATE_NEW_CONSOLE', 0)
+            )
             
             # Update status
             self.status_label.config(
@@ -1,15 +1,30 @@
 import asyncio
+import json
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from functools import lru_cache
 from dotenv import load_dotenv
-from browser_use import Agent, Tools, ChatOpenAI, Browser, ChatGoogle
 from browser_use.agent.views import ActionResult
 from pydantic import BaseModel, Field
-from typing import Optional
-from speech_handler import speak_text, speak_text_sync, configure_speech, get_user_input_with_voice
+from typing import Optional, TYPE_CHECKING
 from hovering_ui import initialize_ui, shutdown_ui, add_ui_message
 from language_utils import initialize_language_manager, get_text, set_language, get_available_languages
 import atexit
 
+if TYPE_CHECKING:
+    from browser_use import Agent, Tools, ChatOpenAI, Browser
+
+# Use uvloop's libuv-backed event loop where available (it doesn't support Windows)
+_loop_factory = None
+if sys.platform != 'win32':
+    try:
+        import uvloop
+        _loop_factory = uvloop.new_event_loop
+    except ImportError:
+        pass
+
 load_dotenv()
 
 # Language Configuration
@@ -26,35 +41,51 @@ if LANGUAGE == 'auto':
 else:
     language_manager = initialize_language_manager(LANGUAGE)
 
-print(f"🌍 Language: {language_manager.get_language_config()['name']} ({language_manager.current_language})")
+# The session language rarely changes, so bind it once (see switch_language)
+CURRENT_LANG = language_manager.current_language
+
+print(f"🌍 Language: {language_manager.get_language_config()['name']} ({CURRENT_LANG})")
+
+def switch_language(language: str) -> bool:
+    """Switch the session language, keeping CURRENT_LANG in sync"""
+    global CURRENT_LANG
+    if set_language(language):
+        CURRENT_LANG = language
+        return True
+    return False
 
 # Initialize the hovering UI with language support
-initialize_ui(width=500, height=400, opacity=0.88, language=language_manager.current_language)
+initialize_ui(width=500, height=400, opacity=0.88, language=CURRENT_LANG, patch_print=True)
 
 # Register cleanup function
 atexit.register(shutdown_ui)
 
-# Configure speech settings
-configure_speech(
-    enabled=True,
-    speak_questions=True,
-    speak_confirmations=True,
-    speak_errors=False,
-    listen_for_responses=True,  # Enable voice input
-    offer_voice_input=True,    # Show voice input options
-    voice_input_default=True,  # Make voice input the default mode
-    recognition_timeout=10,    # 10 second timeout for voice input
-    debug_audio=False,          # Enable audio debugging (hear what was recorded)
-    language=language_manager.current_language  # Use detected/selected language
-)
-
-# Create custom tools for interaction - EXCLUDE ALL automatic data extraction actions
-tools = Tools(exclude_actions=[
-    'extract_structured_data', 
-    'extract_content',
-    'extract_text', 
-    'get_structured_content'
-])
+@lru_cache(maxsize=1)
+def _get_speech():
+    """Import and configure the speech handler on first use (it pulls in heavy audio deps)"""
+    import speech_handler
+    
+    # Configure speech settings
+    speech_handler.configure_speech(
+        enabled=True,
+        speak_questions=True,
+        speak_confirmations=True,
+        speak_errors=False,
+        listen_for_responses=True,  # Enable voice input
+        offer_voice_input=True,    # Show voice input options
+        voice_input_default=True,  # Make voice input the default mode
+        recognition_timeout=10,    # 10 second timeout for voice input
+        debug_audio=False,          # Enable audio debugging (hear what was recorded)
+        language=CURRENT_LANG  # Use detected/selected language
+    )
+    return speech_handler
+
+# Prefix marking a follow-up ActionResult that carries a new task
+NEW_TASK_PREFIX = "New task requested:"
+
+# Follow-up answers meaning the user has nothing more to do
+_DONE_TOKENS = frozenset({'no', 'n', 'nothing', 'done', 'finished', 'exit', 'quit'})
+_MAX_DONE_TOKEN_LEN = max(map(len, _DONE_TOKENS))
 
 class ClarifyingQuestion(BaseModel):
     """Parameters for asking clarifying questions"""
@@ -66,69 +97,134 @@ class FollowUpCheck(BaseModel):
     completion_summary: str = Field(..., description="Summary of what was completed")
     suggestions: Optional[str] = Field(None, description="Optional suggestions for next steps")
 
-@tools.action(
-    description="Ask the user a clarifying question when the task is vague or ambiguous. Use this when you need more specific information to complete the task effectively.",
-    param_model=ClarifyingQuestion
-)
-def ask_clarifying_question(params: ClarifyingQuestion) -> ActionResult:
-    """Ask user for clarification when task is unclear"""
-    print(f"\n🤔 {get_text('agent.clarification_needed')}")
-    print(f"{get_text('agent.context_prefix')} {params.context}")
-    print(f"{get_text('agent.question_prefix')} {params.question}")
+class ClarifyingQuestions(BaseModel):
+    """Parameters for asking several clarifying questions in one step"""
+    questions: list[ClarifyingQuestion] = Field(..., description="All clarifying questions needed to continue the task")
+
+# One worker so queued prompts are spoken in order and never over each other
+_tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts')
+
+def _speak_in_background(*fragments: str) -> asyncio.Future:
+    """Hand text fragments to the TTS worker to be spoken as one batch"""
+    # Fragments are synthesized separately, so playback starts with the first
+    # one and fixed phrases come straight from the audio cache
+    return asyncio.get_running_loop().run_in_executor(_tts_executor, _get_speech().speak_text_sync, fragments)
+
+def _announce(*fragments: str, icon: str = '') -> asyncio.Future:
+    """Print fragments as one message and speak the same fragments in the background"""
+    fragments = tuple(fragment for fragment in fragments if fragment)
+    speech = _speak_in_background(*fragments)
     
-    # Speak the question naturally (synchronous to avoid event loop issues)
-    question_speech = f"{get_text('agent.clarification_needed')} {params.context}. {params.question}"
+    # The icon is only printed; spoken text stays identical to the (prewarmed) phrases
+    print("\n" + (f"{icon} " if icon else "") + "\n".join(fragments))
+    return speech
+
+async def _finish_speech_before_listening(speech: asyncio.Future):
+    """Wait for speech only if the microphone is about to be used, so it doesn't hear it"""
+    if _get_speech().will_listen_for_voice():
+        await speech
+
+async def _get_user_input(prompt: str, voice_prompt: str) -> str:
+    """Read typed or spoken input on a daemon thread so the event loop keeps running"""
+    # Not asyncio.to_thread: the default executor is joined on shutdown, so a
+    # pending input() would keep Ctrl+C from exiting until Enter was pressed
+    future = Future()
+    
+    def read():
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(_get_speech().get_user_input_with_voice(prompt=prompt, voice_prompt=voice_prompt))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    threading.Thread(target=read, name='user-input', daemon=True).start()
+    return await asyncio.wrap_future(future)
+
+def _memory(kind: str, **fields) -> str:
+    """Serialize a long_term_memory entry as compact, structured JSON"""
+    return json.dumps({'kind': kind, **fields}, ensure_ascii=False, separators=(',', ':'))
+
+async def _ask_clarification(params: ClarifyingQuestion) -> str:
+    """Print, speak and collect the answer to a single clarifying question"""
+    # Show and start speaking the question naturally
+    speech = _announce(
+        get_text('agent.clarification_needed'),
+        f"{get_text('agent.context_prefix')} {params.context}",
+        f"{get_text('agent.question_prefix')} {params.question}",
+        icon="🤔"
+    )
     print(f"\n{get_text('agent.speaking_question')}")
-    speak_text_sync(question_speech)
     
-    user_response = get_user_input_with_voice(
+    # Typed input can start while the prompt is still being spoken
+    await _finish_speech_before_listening(speech)
+    
+    # Read input off the event loop so it keeps running
+    user_response = await _get_user_input(
         prompt=f"\n{get_text('voice.text_input_prompt')}",
         voice_prompt=get_text('voice.respond_to', question=params.question)
     )
     
+    if user_response:
+        # Don't speak back the user's response - they just said it
+        print(get_text('agent.received_response', response=user_response))
+    
+    return user_response
+
+async def ask_clarifying_question(params: ClarifyingQuestion) -> ActionResult:
+    """Ask user for clarification when task is unclear"""
+    user_response = await _ask_clarification(params)
+    
     if not user_response:
         return ActionResult(
             extracted_content=get_text('agent.no_clarification'),
             error="No clarification provided"
         )
     
-    # Don't speak back the user's response - they just said it
-    print(get_text('agent.received_response', response=user_response))
-    
     return ActionResult(
         extracted_content=f"User clarification: {user_response}",
-        long_term_memory=f"Clarification received: {params.question} -> {user_response}"
+        long_term_memory=_memory('clarification', question=params.question, answer=user_response)
     )
 
-@tools.action(
-    description="Ask the user if they want to perform any additional tasks after completing the current one. Use this when a task has been successfully completed.",
-    param_model=FollowUpCheck
-)
-def ask_for_follow_up(params: FollowUpCheck) -> ActionResult:
-    """Ask user if they want to do more tasks after completion"""
-    print(f"\n{get_text('agent.task_completed')}")
-    print(f"{get_text('agent.summary_prefix')} {params.completion_summary}")
-    
-    if params.suggestions:
-        print(f"{get_text('agent.suggestions_prefix')} {params.suggestions}")
+async def ask_clarifying_questions(params: ClarifyingQuestions) -> ActionResult:
+    """Ask user all outstanding clarifying questions in one agent step"""
+    pairs = []
+    for question in params.questions:
+        user_response = await _ask_clarification(question)
+        pairs.append({'question': question.question, 'answer': user_response})
     
-    print(f"\n{get_text('agent.anything_else')}")
-    
-    # Speak the completion and question
-    completion_speech = f"{get_text('agent.task_completed')} {params.completion_summary}. "
-    if params.suggestions:
-        completion_speech += f"{get_text('agent.suggestions_prefix')} {params.suggestions}. "
-    completion_speech += get_text('agent.anything_else')
+    if not any(pair['answer'] for pair in pairs):
+        return ActionResult(
+            extracted_content=get_text('agent.no_clarification'),
+            error="No clarification provided"
+        )
     
+    return ActionResult(
+        extracted_content=f"User clarifications: {json.dumps(pairs, ensure_ascii=False)}",
+        long_term_memory=_memory('clarifications', pairs=pairs)
+    )
+
+async def ask_for_follow_up(params: FollowUpCheck) -> ActionResult:
+    """Ask user if they want to do more tasks after completion"""
+    # Show and start speaking the completion and question
+    speech = _announce(
+        get_text('agent.task_completed'),
+        f"{get_text('agent.summary_prefix')} {params.completion_summary}",
+        f"{get_text('agent.suggestions_prefix')} {params.suggestions}" if params.suggestions else '',
+        get_text('agent.anything_else')
+    )
     print(f"\n{get_text('agent.speaking_completion')}")
-    speak_text_sync(completion_speech)
     
-    user_response = get_user_input_with_voice(
+    # Typed input can start while the prompt is still being spoken
+    await _finish_speech_before_listening(speech)
+    
+    # Read input off the event loop so it keeps running
+    user_response = await _get_user_input(
         prompt=get_text('voice.text_input_finish'),
         voice_prompt=get_text('voice.anything_else_prompt')
     )
     
-    if user_response.lower() in ['no', 'n', 'nothing', 'done', 'finished', 'exit', 'quit']:
+    answer = user_response.strip()
+    if len(answer) <= _MAX_DONE_TOKEN_LEN and answer.lower() in _DONE_TOKENS:
         # Don't speak back their "no" response
         print(get_text('agent.received_response', response=user_response))
         return ActionResult(
@@ -140,8 +236,9 @@ def ask_for_follow_up(params: FollowUpCheck) -> ActionResult:
         # Don't speak back their new task request - they just said it
         print(get_text('agent.received_response', response=user_response))
         return ActionResult(
-            extracted_content=f"New task requested: {user_response}",
-            )
+            extracted_content=f"{NEW_TASK_PREFIX} {user_response}",
+            long_term_memory=_memory('follow_up', task=user_response)
+        )
     else:
         return ActionResult(
             extracted_content="User provided no response to follow-up question",
@@ -149,21 +246,21 @@ def ask_for_follow_up(params: FollowUpCheck) -> ActionResult:
             success=True
         )
 
-@tools.action(
-    description="Ask what to do next when you've navigated to a page but the next action is unclear",
-)
-def ask_next_action(current_page: str, available_options: str) -> ActionResult:
+async def ask_next_action(current_page: str, available_options: str) -> ActionResult:
     """Ask user what to do next on the current page"""
-    print(f"\n{get_text('agent.currently_on', page=current_page)}")
-    print(get_text('agent.available_options', options=available_options))
-    print(f"\n{get_text('agent.what_next')}")
-    
-    # Speak the current status and question
-    status_speech = f"{get_text('agent.currently_on', page=current_page)} {get_text('agent.available_options', options=available_options)} {get_text('agent.what_next')}"
+    # Show and start speaking the current status and question
+    speech = _announce(
+        get_text('agent.currently_on', page=current_page),
+        get_text('agent.available_options', options=available_options),
+        get_text('agent.what_next')
+    )
     print(f"\n{get_text('agent.speaking_status')}")
-    speak_text_sync(status_speech)
     
-    user_response = get_user_input_with_voice(
+    # Typed input can start while the prompt is still being spoken
+    await _finish_speech_before_listening(speech)
+    
+    # Read input off the event loop so it keeps running
+    user_response = await _get_user_input(
         prompt=get_text('voice.text_input_prompt'),
         voice_prompt=get_text('voice.what_next_prompt')
     )
@@ -179,220 +276,236 @@ def ask_next_action(current_page: str, available_options: str) -> ActionResult:
     
     return ActionResult(
         extracted_content=f"User wants next action: {user_response}",
-        long_term_memory=f"Next action on {current_page}: {user_response}"
+        long_term_memory=_memory('next_action', page=current_page, action=user_response)
     )
 
-# Multilingual system messages
-SYSTEM_MESSAGES = {
-    'en': """
-You are a helpful browser automation agent with specialized communication skills:
-
-LANGUAGE INSTRUCTION: COMMUNICATE ONLY IN ENGLISH. All your questions, responses, and explanations must be in English.
-
-CRITICAL ANTI-EXTRACTION RULES:
-- NEVER automatically extract data unless explicitly asked to do so
-- Do NOT use extract_structured_data, extract_content, or similar actions without explicit request
-- Focus on NAVIGATION and INTERACTION, not data scraping
-- After completing navigation/interaction, ask the user what they want to do next
-
-CLARIFICATION GUIDELINES:
-- When a task is vague, ambiguous, or lacks specific details, use the 'ask_clarifying_question' action
-- Ask specific questions about which website to visit, what information to look for, what actions to take
-- Examples: "Search for something" -> Ask what and where; "Find information" -> Ask what specific information
-
-COMPLETION GUIDELINES:
-- After successfully completing any task, always use the 'ask_for_follow_up' action
-- Provide clear summaries and suggest logical next steps
-- STOP and ASK rather than automatically continuing with data extraction
-
-INTERACTION STYLE:
-- Be proactive in asking for clarification rather than making assumptions
-- Be conversational and helpful
-- Always check if the user wants to do more after completing a task
-""",
-    'es': """
-Eres un agente útil de automatización de navegador con habilidades de comunicación especializadas:
-
-INSTRUCCIÓN DE IDIOMA: COMUNÍCATE SOLO EN ESPAÑOL. Todas tus preguntas, respuestas y explicaciones deben estar en español.
-
-REGLAS CRÍTICAS ANTI-EXTRACCIÓN:
-- NUNCA extraigas datos automáticamente a menos que se te pida explícitamente
-- NO uses extract_structured_data, extract_content, u acciones similares sin solicitud explícita
-- Enfócate en NAVEGACIÓN e INTERACCIÓN, no en extracción de datos
-- Después de completar navegación/interacción, pregunta al usuario qué quiere hacer a continuación
-
-PAUTAS DE ACLARACIÓN:
-- Cuando una tarea sea vaga o ambigua, usa la acción 'ask_clarifying_question'
-- Haz preguntas específicas sobre qué sitio web visitar, qué información buscar, qué acciones tomar
-- Ejemplos: "Buscar algo" -> Pregunta qué y dónde; "Encontrar información" -> Pregunta qué información específica
-
-PAUTAS DE FINALIZACIÓN:
-- Después de completar exitosamente cualquier tarea, siempre usa la acción 'ask_for_follow_up'
-- Proporciona resúmenes claros y sugiere próximos pasos lógicos
-- DETENTE y PREGUNTA en lugar de continuar automáticamente con extracción de datos
-
-ESTILO DE INTERACCIÓN:
-- Sé proactivo pidiendo aclaraciones en lugar de hacer suposiciones
-- Sé conversacional y útil
-- Siempre verifica si el usuario quiere hacer más después de completar una tarea
-""",
-    'fr': """
-Vous êtes un agent d'automatisation de navigateur utile avec des compétences de communication spécialisées:
-
-INSTRUCTION LINGUISTIQUE: COMMUNIQUEZ UNIQUEMENT EN FRANÇAIS. Toutes vos questions, réponses et explications doivent être en français.
-
-RÈGLES CRITIQUES ANTI-EXTRACTION:
-- Ne JAMAIS extraire de données automatiquement sauf si explicitement demandé
-- N'utilisez PAS extract_structured_data, extract_content, ou actions similaires sans demande explicite
-- Concentrez-vous sur la NAVIGATION et l'INTERACTION, pas sur l'extraction de données
-- Après avoir terminé navigation/interaction, demandez à l'utilisateur ce qu'il veut faire ensuite
-
-DIRECTIVES DE CLARIFICATION:
-- Quand une tâche est vague ou ambiguë, utilisez l'action 'ask_clarifying_question'
-- Posez des questions spécifiques sur quel site web visiter, quelles informations chercher, quelles actions prendre
-- Exemples: "Chercher quelque chose" -> Demandez quoi et où; "Trouver des informations" -> Demandez quelles informations spécifiques
-
-DIRECTIVES DE FINALISATION:
-- Après avoir terminé avec succès une tâche, utilisez toujours l'action 'ask_for_follow_up'
-- Fournissez des résumés clairs et suggérez les prochaines étapes logiques
-- ARRÊTEZ et DEMANDEZ plutôt que de continuer automatiquement avec l'extraction de données
-
-STYLE D'INTERACTION:
-- Soyez proactif en demandant des clarifications plutôt que de faire des suppositions
-- Soyez conversationnel et utile
-- Vérifiez toujours si l'utilisateur veut en faire plus après avoir terminé une tâche
-""",
-    'de': """
-Sie sind ein hilfreicher Browser-Automatisierungsagent mit speziellen Kommunikationsfähigkeiten:
-
-SPRACHLICHE ANWEISUNG: KOMMUNIZIEREN SIE NUR AUF DEUTSCH. Alle Ihre Fragen, Antworten und Erklärungen müssen auf Deutsch sein.
-
-KRITISCHE ANTI-EXTRAKTIONS-REGELN:
-- Extrahieren Sie NIEMALS automatisch Daten, es sei denn, dies wird explizit verlangt
-- Verwenden Sie NICHT extract_structured_data, extract_content oder ähnliche Aktionen ohne explizite Anfrage
-- Konzentrieren Sie sich auf NAVIGATION und INTERAKTION, nicht auf Datenextraktion
-- Nach Abschluss von Navigation/Interaktion fragen Sie den Benutzer, was er als nächstes tun möchte
-
-KLARSTELLUNGSRICHTLINIEN:
-- Wenn eine Aufgabe vage oder mehrdeutig ist, verwenden Sie die Aktion 'ask_clarifying_question'
-- Stellen Sie spezifische Fragen über welche Website zu besuchen, welche Informationen zu suchen, welche Aktionen zu unternehmen
-- Beispiele: "Etwas suchen" -> Fragen was und wo; "Informationen finden" -> Fragen welche spezifischen Informationen
-
-ABSCHLUSSRICHTLINIEN:
-- Nach erfolgreichem Abschluss einer Aufgabe verwenden Sie immer die Aktion 'ask_for_follow_up'
-- Geben Sie klare Zusammenfassungen und schlagen logische nächste Schritte vor
-- STOPPEN und FRAGEN Sie anstatt automatisch mit Datenextraktion fortzufahren
-
-INTERAKTIONSSTIL:
-- Seien Sie proaktiv beim Nachfragen nach Klarstellungen anstatt Annahmen zu treffen
-- Seien Sie gesprächig und hilfsbereit
-- Überprüfen Sie immer, ob der Benutzer nach Abschluss einer Aufgabe mehr tun möchte
-""",
-    'zh': """
-您是一个有用的浏览器自动化助手，具有专业的沟通技能：
-
-语言指令：仅使用中文交流。您的所有问题、回答和解释都必须使用中文。
-
-关键反提取规则：
-- 除非明确要求，否则绝不自动提取数据
-- 不要在没有明确请求的情况下使用extract_structured_data、extract_content或类似操作
-- 专注于导航和交互，而不是数据抓取
-- 完成导航/交互后，询问用户接下来想做什么
-
-澄清指南：
-- 当任务模糊或不明确时，使用'ask_clarifying_question'操作
-- 询问具体问题：访问哪个网站、寻找什么信息、采取什么行动
-- 示例："搜索某些内容"→询问搜索什么和在哪里；"查找信息"→询问什么具体信息
-
-完成指南：
-- 成功完成任何任务后，始终使用'ask_for_follow_up'操作
-- 提供清晰的摘要并建议合理的后续步骤
-- 停止并询问而不是自动继续数据提取
-
-交互风格：
-- 主动寻求澄清而不是做假设
-- 对话式且有帮助
-- 完成任务后始终检查用户是否想要做更多事情
-"""
-}
+# Set by request_vision_for_next_step and consumed by the step hooks below
+_vision_requested = False
+_vision_one_shot = False
+
+async def request_vision_for_next_step() -> ActionResult:
+    """Turn on vision for exactly one upcoming agent step"""
+    global _vision_requested
+    _vision_requested = True
+    return ActionResult(extracted_content="A screenshot will be included in the next step")
+
+async def _enable_requested_vision(agent: 'Agent'):
+    """Step-start hook: enable vision for this step if it was requested"""
+    global _vision_requested, _vision_one_shot
+    if _vision_requested:
+        _vision_requested = False
+        if not agent.settings.use_vision:
+            agent.settings.use_vision = True
+            _vision_one_shot = True
+
+async def _reset_requested_vision(agent: 'Agent'):
+    """Step-end hook: turn one-shot vision back off"""
+    global _vision_one_shot
+    if _vision_one_shot:
+        agent.settings.use_vision = False
+        _vision_one_shot = False
+
+@lru_cache(maxsize=1)
+def get_tools() -> 'Tools':
+    """Build the agent tools and register the interactive actions (once per process)"""
+    from browser_use import Tools
+    
+    # Create custom tools for interaction - EXCLUDE ALL automatic data extraction actions
+    tools = Tools(exclude_actions=[
+        'extract_structured_data', 
+        'extract_content',
+        'extract_text', 
+        'get_structured_content'
+    ])
+    
+    tools.action(
+        description="Ask the user a clarifying question when the task is vague or ambiguous. Use this when you need more specific information to complete the task effectively.",
+        param_model=ClarifyingQuestion
+    )(ask_clarifying_question)
+    
+    tools.action(
+        description="Ask the user several clarifying questions in a single step. Use this instead of repeated 'ask_clarifying_question' calls whenever more than one clarification is needed.",
+        param_model=ClarifyingQuestions
+    )(ask_clarifying_questions)
+    
+    tools.action(
+        description="Ask the user if they want to perform any additional tasks after completing the current one. Use this when a task has been successfully completed.",
+        param_model=FollowUpCheck
+    )(ask_for_follow_up)
+    
+    tools.action(
+        description="Ask what to do next when you've navigated to a page but the next action is unclear",
+    )(ask_next_action)
+    
+    tools.action(
+        description="Include a screenshot of the page in your next step. Screenshots are off by default to save tokens; use this only when you need to see layout, images or visual state.",
+    )(request_vision_for_next_step)
+    
+    return tools
 
+# Multilingual system messages live in prompts/system_<lang>.txt so only the
+# active language is ever loaded. Each prompt is handed to the agent as-is, so
+# every step sends a byte-identical system prompt prefix and the provider's
+# automatic prompt caching can reuse it. Keep them free of per-session or
+# per-step content (timestamps, task text, etc.).
+PROMPTS_DIR = Path(__file__).parent / 'prompts'
+
+@lru_cache(maxsize=1)
 def get_system_message(language: str = 'en') -> str:
     """Get system message for the specified language"""
-    return SYSTEM_MESSAGES.get(language, SYSTEM_MESSAGES['en'])
-
-async def create_clarifying_agent(task: str, language: str = None):
-    """Create an agent that asks clarifying questions and follow-ups"""
-    
-    llm = ChatOpenAI(model='gpt-4.1-mini')
-    
-    browser = Browser(
+    prompt_file = PROMPTS_DIR / f'system_{language}.txt'
+    if not prompt_file.exists():
+        prompt_file = PROMPTS_DIR / 'system_en.txt'
+    return prompt_file.read_text(encoding='utf-8')
+
+@lru_cache(maxsize=1)
+def get_llm() -> 'ChatOpenAI':
+    """Get the shared LLM client (reused so its HTTP connection pool stays warm)"""
+    from browser_use import ChatOpenAI
+    return ChatOpenAI(model='gpt-4.1-mini')
+
+@lru_cache(maxsize=1)
+def get_browser() -> 'Browser':
+    """Get the shared browser (launched once and reused across agents)"""
+    from browser_use import Browser
+    return Browser(
         window_size={'width': 1920, 'height': 1080},
         headless=False
     )
 
+async def close_browser():
+    """Close the shared browser if one was created"""
+    if get_browser.cache_info().currsize:
+        try:
+            await get_browser().kill()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+        get_browser.cache_clear()
+
+async def _prepare_agent_stack():
+    """Import the agent stack, build the LLM client and launch the shared browser"""
+    await asyncio.to_thread(get_llm)
+    browser = await asyncio.to_thread(get_browser)
+    await browser.start()
+
+async def create_clarifying_agent(task: str, language: str = None, use_vision: bool = False):
+    """
+    Create an agent that asks clarifying questions and follow-ups
+    
+    Args:
+        use_vision: Send a screenshot every step. Off by default since image tokens
+            dominate per-step cost; the agent can still opt in per step with
+            'request_vision_for_next_step' when run with the vision step hooks.
+    """
+    # The agent stack is imported on first use so the UI and greeting come up sooner
+    from browser_use import Agent
+    
+    llm = get_llm()
+    browser = get_browser()
+
     # Get appropriate system message for language
-    current_language = language or language_manager.current_language
-    system_message = get_system_message(current_language)
+    system_message = get_system_message(language or CURRENT_LANG)
 
     agent = Agent(
         task=task,
         browser=browser,
         llm=llm,
-        tools=tools,
+        tools=get_tools(),
         extend_system_message=system_message,
         max_actions_per_step=3,  # Reduced to prevent too many actions at once
         use_thinking=True,
         # Additional controls to prevent automatic behavior
-        use_vision=True,
+        use_vision=use_vision,
         final_response_after_failure=True
     )
     
     return agent
 
+def _last_action_result(history) -> Optional[ActionResult]:
+    """Get the most recent ActionResult by indexing, without walking the history"""
+    if history.history and history.history[-1].result:
+        return history.history[-1].result[-1]
+    return None
+
+# Step limits: the first task gets a small budget; follow-up tasks get up to
+# FOLLOW_UP_MAX_STEPS each, capped by what's left of the session budget
+INITIAL_MAX_STEPS = 8
+FOLLOW_UP_MAX_STEPS = 20
+SESSION_MAX_STEPS = 60
+
 async def run_interactive_session():
     """Run an interactive session with the clarifying agent"""
     print(get_text("agent.session_separator"))
     print(get_text("agent.session_separator"))
     
-    # Speak greeting
-    greeting = get_text("agent.greeting")
-    await speak_text(greeting)
-    
-    # Get initial task from user
-    initial_task = get_user_input_with_voice(
-        prompt=get_text('voice.text_input_prompt'),
-        voice_prompt=get_text('voice.prompt_help')
-    )
-    
-    if not initial_task:
-        print(get_text("agent.no_response"))
-        return
-    
-    # Don't speak back the user's task - they just said it
-    print(get_text("agent.task_received", task=initial_task))
+    # Connect to ElevenLabs and synthesize the greeting while the microphone calibrates
+    _get_speech().warm_up_speech()
     
-    # Create and run agent
-    agent = await create_clarifying_agent(initial_task, language_manager.current_language)
+    agent_stack = None
+    farewell = None
     
     try:
+        # Launch the browser and LLM client during calibration and while the user is giving their task
+        agent_stack = asyncio.create_task(_prepare_agent_stack())
+        
+        # Keep one calibrated microphone stream open for every prompt this session;
+        # calibrating before the greeting plays keeps its sound out of the noise level
+        await _get_speech().start_voice_prefetcher()
+        
+        # Speak greeting; with typed input the user can start before it finishes
+        greeting = _speak_in_background(get_text("agent.greeting"))
+        await _finish_speech_before_listening(greeting)
+        
+        # Get initial task from user
+        initial_task = await _get_user_input(
+            prompt=get_text('voice.text_input_prompt'),
+            voice_prompt=get_text('voice.prompt_help')
+        )
+        
+        if not initial_task:
+            print(get_text("agent.no_response"))
+            return
+        
+        # Don't speak back the user's task - they just said it
+        print(get_text("agent.task_received", task=initial_task))
+        
+        # Create and run agent (if warm-up failed, the agent surfaces the error itself)
+        await asyncio.gather(agent_stack, return_exceptions=True)
+        agent = await create_clarifying_agent(initial_task)
+        
+        max_steps = INITIAL_MAX_STEPS
+        
         while True:
             print(f"\n{get_text('agent.current_task', task=agent.task)}")
             print("-" * 30)
             
             # Run the agent
-            history = await agent.run(max_steps=20)
+            history = await agent.run(
+                max_steps=max_steps,
+                on_step_start=_enable_requested_vision,
+                on_step_end=_reset_requested_vision
+            )
             
             # Check if we got a follow-up task
             if history.is_done():
+                # Say goodbye while the browser shuts down
                 print(f"\n{get_text('ui.session_completed')}")
-                await speak_text(get_text('ui.session_completed'))
+                farewell = _speak_in_background(get_text('ui.session_completed'))
                 break
             
-            # Look for new tasks in the history
-            last_result = history.final_result()
-            if last_result and "New task requested:" in str(last_result):
+            # Look for a new task in the most recent action result
+            last_result = _last_action_result(history)
+            content = last_result.extracted_content if last_result else None
+            if content and content.startswith(NEW_TASK_PREFIX):
                 # Extract the new task
-                new_task = str(last_result).replace("New task requested:", "").strip()
+                new_task = content.removeprefix(NEW_TASK_PREFIX).strip()
+                
+                # The agent's history accumulates across tasks
+                remaining_steps = SESSION_MAX_STEPS - history.number_of_steps()
+                if remaining_steps <= 0:
+                    break
+                max_steps = min(FOLLOW_UP_MAX_STEPS, remaining_steps)
+                
                 print(get_text('agent.new_task', task=new_task))
                 agent.add_new_task(new_task)
             else:
@@ -403,24 +516,32 @@ async def run_interactive_session():
     except Exception as e:
         print(f"\n{get_text('ui.error_occurred', error=str(e))}")
     finally:
-        # Ensure UI cleanup
+        # Ensure browser, microphone and UI cleanup on every path, including setup
+        if agent_stack:
+            await asyncio.gather(agent_stack, return_exceptions=True)
+        await close_browser()
+        await _get_speech().stop_voice_prefetcher()
+        if farewell:
+            await farewell
+        await _get_speech().close_speech()
         shutdown_ui()
 
 # Example usage functions
 async def example_vague_task():
     """Example with a vague task that should trigger clarifying questions"""
     agent = await create_clarifying_agent("Find some information online")
-    await agent.run()
+    await agent.run(on_step_start=_enable_requested_vision, on_step_end=_reset_requested_vision)
 
 async def example_specific_task():
     """Example with a specific task that should complete and ask for follow-up"""
     agent = await create_clarifying_agent("Go to google.com and search for 'browser automation python' then take a screenshot")
-    await agent.run()
+    await agent.run(on_step_start=_enable_requested_vision, on_step_end=_reset_requested_vision)
 
 if __name__ == "__main__":
     try:
         # Run interactive session
-        asyncio.run(run_interactive_session())
+        with asyncio.Runner(loop_factory=_loop_factory) as runner:
+            runner.run(run_interactive_session())
     except KeyboardInterrupt:
         print("\n\nShutting down...")
         shutdown_ui()
@@ -5,8 +5,8 @@ Shows all available microphones and identifies which one is being used for recor
 """
 
 import speech_recognition as sr
-import pyaudio
 import sys
+from audio_devices import SharedMicrophone, get_device_info, list_input_devices
 
 def list_all_microphones():
     """List all available audio input devices"""
@@ -14,36 +14,17 @@ def list_all_microphones():
     print("=" * 40)
     
     try:
-        # Initialize PyAudio to get device info
-        p = pyaudio.PyAudio()
-        
-        device_count = p.get_device_count()
-        input_devices = []
-        
-        for i in range(device_count):
-            device_info = p.get_device_info_by_index(i)
-            
-            # Only show input devices (microphones)
-            if device_info['maxInputChannels'] > 0:
-                input_devices.append({
-                    'index': i,
-                    'name': device_info['name'],
-                    'channels': device_info['maxInputChannels'],
-                    'sample_rate': int(device_info['defaultSampleRate']),
-                    'is_default': i == p.get_default_input_device_info()['index']
-                })
-        
-        p.terminate()
+        input_devices = list(list_input_devices())
         
         if not input_devices:
             print("❌ No microphones found!")
             return None
             
         # Display all input devices
-        for i, device in enumerate(input_devices):
-            default_marker = " (DEFAULT)" if device['is_default'] else ""
-            print(f"{device['index']:2d}: {device['name']}{default_marker}")
-            print(f"     Channels: {device['channels']}, Sample Rate: {device['sample_rate']} Hz")
+        for device in input_devices:
+            default_marker = " (DEFAULT)" if device.is_default else ""
+            print(f"{device.index:2d}: {device.name}{default_marker}")
+            print(f"     Channels: {device.channels}, Sample Rate: {device.sample_rate} Hz")
         
         return input_devices
         
@@ -61,29 +42,21 @@ def get_speech_recognition_microphone():
         r = sr.Recognizer()
         
         # Get default microphone
-        mic = sr.Microphone()
+        mic = SharedMicrophone()
         
         print(f"Device Index: {mic.device_index}")
         
-        # Get device info using PyAudio
-        p = pyaudio.PyAudio()
-        
+        # Get device info using the shared PyAudio instance
+        device_info = get_device_info(mic.device_index)
         if mic.device_index is None:
-            # Using system default
-            default_device = p.get_default_input_device_info()
-            device_info = default_device
             print("Using: System Default Microphone")
         else:
-            # Using specific device index
-            device_info = p.get_device_info_by_index(mic.device_index)
             print(f"Using: Device #{mic.device_index}")
         
         print(f"Name: {device_info['name']}")
         print(f"Channels: {device_info['maxInputChannels']}")
         print(f"Sample Rate: {int(device_info['defaultSampleRate'])} Hz")
         
-        p.terminate()
-        
         return device_info
         
     except Exception as e:
@@ -97,20 +70,20 @@ def test_microphone_recording():
     
     try:
         r = sr.Recognizer()
-        mic = sr.Microphone()
+        mic = SharedMicrophone()
         
-        print("🔧 Calibrating microphone...")
+        # Calibrate and capture on one open stream rather than reopening the device
         with mic as source:
+            print("🔧 Calibrating microphone...")
             r.adjust_for_ambient_noise(source, duration=1)
-        
-        print("✅ Microphone calibration successful")
-        print("🎤 Testing audio capture (2 seconds)...")
-        
-        with mic as source:
+            
+            print("✅ Microphone calibration successful")
+            print("🎤 Testing audio capture (2 seconds)...")
+            
             audio = r.listen(source, timeout=1, phrase_time_limit=2)
         
         print("✅ Audio capture successful")
-        print(f"📊 Audio data size: {len(audio.get_wav_data())} bytes")
+        print(f"📊 Audio data size: {len(audio.frame_data)} bytes (raw PCM)")
         
         return True
         
@@ -141,19 +114,15 @@ def show_microphone_usage_in_browser4all():
             # Get the device index that our recognizer is using
             device_index = recognizer.microphone.device_index
             
-            p = pyaudio.PyAudio()
-            
+            device_info = get_device_info(device_index)
             if device_index is None:
-                device_info = p.get_default_input_device_info()
                 print("Using: System Default Microphone")
             else:
-                device_info = p.get_device_info_by_index(device_index)
                 print(f"Using: Device #{device_index}")
             
             print(f"Name: {device_info['name']}")
             print(f"Channels: {device_info['maxInputChannels']}")
             
-            p.terminate()
             return True
             
     except ImportError:
@@ -190,9 +159,9 @@ def main():
     print("📋 Summary:")
     print(f"   • Found {len(devices)} microphone(s)")
     
-    default_devices = [d for d in devices if d['is_default']]
-    if default_devices:
-        print(f"   • Default: {default_devices[0]['name']}")
+    default_name = next((d.name for d in devices if d.is_default), None)
+    if default_name:
+        print(f"   • Default: {default_name}")
     
     print("   • Speech recognition: Ready")
     print("\n💡 Tip: If you have multiple microphones, the default one will be used.")
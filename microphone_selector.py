@@ -5,8 +5,8 @@ Allows you to choose which microphone to use for Browser4All voice input.
 """
 
 import speech_recognition as sr
-import pyaudio
 import sys
+from audio_devices import SharedMicrophone, list_input_devices
 
 def list_microphones():
     """List available microphones with their indices"""
@@ -14,40 +14,25 @@ def list_microphones():
     print("=" * 25)
     
     try:
-        p = pyaudio.PyAudio()
-        device_count = p.get_device_count()
-        input_devices = []
+        input_devices = list(list_input_devices())
         
-        for i in range(device_count):
-            device_info = p.get_device_info_by_index(i)
-            
-            # Only show input devices (microphones)
-            if device_info['maxInputChannels'] > 0:
-                input_devices.append({
-                    'index': i,
-                    'name': device_info['name'],
-                    'channels': device_info['maxInputChannels'],
-                    'sample_rate': int(device_info['defaultSampleRate']),
-                    'is_default': i == p.get_default_input_device_info()['index']
-                })
-        
-        p.terminate()
-        
-        # Show Realtek devices prominently
-        realtek_devices = [d for d in input_devices if 'Realtek' in d['name']]
-        other_devices = [d for d in input_devices if 'Realtek' not in d['name']]
+        # Show Realtek devices prominently (split in a single pass)
+        realtek_devices = []
+        other_devices = []
+        for device in input_devices:
+            (realtek_devices if 'Realtek' in device.name else other_devices).append(device)
         
         print("🔊 Realtek Audio Devices:")
         for device in realtek_devices:
-            default_marker = " (CURRENT DEFAULT)" if device['is_default'] else ""
-            print(f"  {device['index']:2d}: {device['name']}{default_marker}")
-            print(f"      Channels: {device['channels']}, Sample Rate: {device['sample_rate']} Hz")
+            default_marker = " (CURRENT DEFAULT)" if device.is_default else ""
+            print(f"  {device.index:2d}: {device.name}{default_marker}")
+            print(f"      Channels: {device.channels}, Sample Rate: {device.sample_rate} Hz")
         
         print("\n🎤 Other Microphones:")
         for device in other_devices:
-            default_marker = " (CURRENT DEFAULT)" if device['is_default'] else ""
-            print(f"  {device['index']:2d}: {device['name']}{default_marker}")
-            print(f"      Channels: {device['channels']}, Sample Rate: {device['sample_rate']} Hz")
+            default_marker = " (CURRENT DEFAULT)" if device.is_default else ""
+            print(f"  {device.index:2d}: {device.name}{default_marker}")
+            print(f"      Channels: {device.channels}, Sample Rate: {device.sample_rate} Hz")
         
         return input_devices
         
@@ -55,27 +40,32 @@ def list_microphones():
         print(f"❌ Error listing microphones: {e}")
         return []
 
-def test_microphone(device_index):
+def test_microphone(device):
     """Test a specific microphone"""
-    print(f"\n🔬 Testing microphone {device_index}...")
+    print(f"\n🔬 Testing microphone {device.index}...")
     
     try:
-        # Create microphone with specific device index
+        # Open the device at its native rate with a buffer sized to its low-latency
+        # setting, so PortAudio doesn't resample or add buffering
         r = sr.Recognizer()
-        mic = sr.Microphone(device_index=device_index)
-        
-        print("🔧 Calibrating microphone...")
-        with mic as source:
-            r.adjust_for_ambient_noise(source, duration=1)
-        
-        print("✅ Microphone calibration successful")
-        print("🎤 Testing audio capture (say something for 2 seconds)...")
+        mic = SharedMicrophone(
+            device_index=device.index,
+            sample_rate=device.sample_rate,
+            chunk_size=max(256, int(device.sample_rate * device.low_input_latency))
+        )
         
+        # Calibrate and capture on one open stream rather than reopening the device
         with mic as source:
+            print("🔧 Calibrating microphone...")
+            r.adjust_for_ambient_noise(source, duration=0.5)
+            
+            print("✅ Microphone calibration successful")
+            print("🎤 Testing audio capture (say something for 2 seconds)...")
+            
             audio = r.listen(source, timeout=3, phrase_time_limit=2)
         
         print("✅ Audio capture successful")
-        print(f"📊 Audio data size: {len(audio.get_wav_data())} bytes")
+        print(f"📊 Audio data size: {len(audio.frame_data)} bytes (raw PCM)")
         
         # Try to recognize what was said
         try:
@@ -100,13 +90,15 @@ def create_custom_speech_handler():
         print("❌ No microphones found!")
         return
     
+    devices_by_index = {d.index: d for d in devices}
+    
     # Find Realtek devices
-    realtek_devices = [d for d in devices if 'Realtek' in d['name'] and 'Array' in d['name']]
+    realtek_devices = [d for d in devices if 'Realtek' in d.name and 'Array' in d.name]
     
     if realtek_devices:
         print(f"\n💡 Recommended Realtek microphones:")
         for device in realtek_devices:
-            print(f"   Device {device['index']}: {device['name']}")
+            print(f"   Device {device.index}: {device.name}")
     
     print("\n🎯 Choose your microphone:")
     print("   • Enter device number to select")
@@ -125,9 +117,8 @@ def create_custom_speech_handler():
         try:
             device_index = int(choice)
             # Validate device exists
-            valid_indices = [d['index'] for d in devices]
-            if device_index not in valid_indices:
-                print(f"❌ Invalid device index. Available: {valid_indices}")
+            if device_index not in devices_by_index:
+                print(f"❌ Invalid device index. Available: {list(devices_by_index)}")
                 return
         except ValueError:
             print("❌ Invalid input. Please enter a number.")
@@ -135,10 +126,10 @@ def create_custom_speech_handler():
     
     # Test the selected microphone
     if device_index is not None:
-        selected_device = next((d for d in devices if d['index'] == device_index), None)
-        print(f"\n🎤 Selected: {selected_device['name']}")
+        selected_device = devices_by_index[device_index]
+        print(f"\n🎤 Selected: {selected_device.name}")
         
-        if not test_microphone(device_index):
+        if not test_microphone(selected_device):
             print("❌ Microphone test failed. Please try another device.")
             return
     
@@ -150,13 +141,10 @@ def create_custom_speech_handler():
     if device_index is None:
         print("✅ You're using the default microphone (no changes needed)")
     else:
-        print(f"Add this code to your speech_handler.py:")
+        print(f"Save this in speech_config.json next to speech_handler.py:")
         print()
-        print("```python")
-        print("# In the SpeechRecognizer.__init__ method, change:")
-        print("# self.microphone = sr.Microphone()")
-        print("# to:")
-        print(f"self.microphone = sr.Microphone(device_index={device_index})")
+        print("```json")
+        print(f'{{"device_index": {device_index}}}')
         print("```")
         print()
         print("Or use the automatic update option below...")
@@ -164,35 +152,20 @@ def create_custom_speech_handler():
     return device_index
 
 def update_speech_handler_automatically(device_index):
-    """Automatically update speech_handler.py with new microphone"""
+    """Save the selected microphone to the speech config file"""
     if device_index is None:
         print("No changes needed for default microphone.")
         return
     
     try:
-        # Read current speech_handler.py
-        with open('speech_handler.py', 'r') as f:
-            content = f.read()
-        
-        # Replace microphone initialization
-        old_line = "self.microphone = sr.Microphone()"
-        new_line = f"self.microphone = sr.Microphone(device_index={device_index})"
+        from speech_handler import save_microphone_config
         
-        if old_line in content:
-            updated_content = content.replace(old_line, new_line)
-            
-            # Write back to file
-            with open('speech_handler.py', 'w') as f:
-                f.write(updated_content)
-            
-            print(f"✅ Updated speech_handler.py to use microphone {device_index}")
-            print("🔄 Restart your Browser4All application to use the new microphone")
-        else:
-            print("⚠️ Could not find microphone initialization line in speech_handler.py")
-            print("You may need to update it manually.")
+        save_microphone_config(device_index)
+        print(f"✅ Saved microphone {device_index} to speech_config.json")
+        print("🔄 Restart your Browser4All application to use the new microphone")
         
     except Exception as e:
-        print(f"❌ Error updating speech_handler.py: {e}")
+        print(f"❌ Error saving speech_config.json: {e}")
 
 def main():
     """Main microphone selection interface"""
@@ -203,7 +176,7 @@ def main():
     
     if device_index is not None:
         print("\n🔧 Would you like to automatically update Browser4All?")
-        update_choice = input("Update speech_handler.py automatically? (y/n): ").strip().lower()
+        update_choice = input("Save this microphone to speech_config.json? (y/n): ").strip().lower()
         
         if update_choice == 'y':
             update_speech_handler_automatically(device_index)
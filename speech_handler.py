@@ -1,20 +1,127 @@
 import os
+import atexit
+import io
+import re
+import json
+import hashlib
 import asyncio
-import aiohttp
-import pygame
 import tempfile
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, ClassVar, Mapping, Optional, Sequence, Union
 import logging
 import speech_recognition as sr
 import threading
 import time
-import wave
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext, suppress
 from language_utils import get_language_manager, get_text, get_speech_config
 
+# pygame (SDL) and aiohttp are imported where they are used, so importing this
+# module for configuration or voice input doesn't pay for audio output
+if TYPE_CHECKING:
+    import aiohttp
+
+# Microphone choice saved by microphone_selector.py
+MICROPHONE_CONFIG_FILE = Path(__file__).parent / 'speech_config.json'
+
+def load_microphone_config() -> dict:
+    """Load the saved microphone settings, or an empty dict if there are none"""
+    try:
+        with open(MICROPHONE_CONFIG_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_microphone_config(device_index: Optional[int]):
+    """Save the microphone device index (None for the system default)"""
+    config = load_microphone_config()
+    config['device_index'] = device_index
+    
+    # Write to a temp file first so a crash can't leave a half-written config
+    tmp_file = MICROPHONE_CONFIG_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+    os.replace(tmp_file, MICROPHONE_CONFIG_FILE)
+
+_microphone_config = load_microphone_config()
+
+# Sentence boundaries used to split text into separately synthesized pieces
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|(?<=[。！？])')
+
+# Fixed phrases spoken in every session, synthesized ahead of time by warm_up_speech
+_PREWARM_TEXT_KEYS = (
+    'agent.greeting',
+    'agent.clarification_needed',
+    'agent.task_completed',
+    'agent.anything_else',
+    'agent.what_next',
+    'ui.session_completed',
+)
+
+def _split_sentences(fragments: Sequence[str]) -> list:
+    """Split text fragments into the sentences that are synthesized separately"""
+    return [sentence for fragment in fragments if fragment
+            for sentence in _SENTENCE_BOUNDARY.split(fragment) if sentence.strip()]
+
+# Mixer buffer in samples; smaller starts playback sooner, larger avoids
+# underruns on slow machines (override with B4A_MIXER_BUFFER)
+MIXER_BUFFER = 1024
+
+def _mixer_buffer_size() -> int:
+    """Mixer buffer from B4A_MIXER_BUFFER as a power of two, or MIXER_BUFFER if it isn't usable"""
+    value = os.getenv("B4A_MIXER_BUFFER")
+    if not value:
+        return MIXER_BUFFER
+    
+    try:
+        requested = int(value)
+    except ValueError:
+        requested = 0
+    if requested <= 0:
+        logging.getLogger(__name__).warning(f"Ignoring B4A_MIXER_BUFFER={value!r}; using {MIXER_BUFFER}")
+        return MIXER_BUFFER
+    
+    # SDL expects a power of two; round down and keep it within sensible bounds
+    buffer = min(max(1 << (requested.bit_length() - 1), 64), 8192)
+    if buffer != requested:
+        logging.getLogger(__name__).warning(f"B4A_MIXER_BUFFER={requested} adjusted to {buffer}")
+    return buffer
+
+def _init_mixer():
+    """Open the one pygame mixer shared by speech and debug playback, if it isn't open yet"""
+    import pygame
+    
+    if not pygame.mixer.get_init():
+        # Match ElevenLabs' 44.1 kHz MP3 output so SDL doesn't resample every clip
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=_mixer_buffer_size())
+        atexit.register(pygame.mixer.quit)
+
 class ElevenLabsSpeech:
     """Natural-sounding speech using ElevenLabs API"""
     
+    # Popular ElevenLabs voice IDs with descriptions (read-only)
+    _VOICES: ClassVar[Mapping[str, str]] = MappingProxyType({
+        "21m00Tcm4TlvDq8ikWAM": "Rachel - Pleasant female, clear",
+        "AZnzlk1XvdvUeBnXmlld": "Domi - Confident female, strong", 
+        "EXAVITQu4vr4xnSDxMaL": "Bella - Soft female, gentle",
+        "ErXwobaYiN019PkySvjV": "Antoni - Calm male, professional",
+        "VR6AewLTigWG4xSOukaG": "Arnold - Deep male, authoritative",
+        "pNInz6obpgDQGcFmaJgB": "Adam - Friendly male, casual",
+        "yoZ06aMxZJJ28mfd3POQ": "Sam - Natural male, conversational"
+    })
+    
+    # Favour time-to-first-byte, and ask for exactly the format the mixer plays
+    STREAM_PARAMS = {"optimize_streaming_latency": "3", "output_format": "mp3_44100_128"}
+    
+    # Number of synthesized phrases kept in memory for instant replay
+    AUDIO_CACHE_SIZE = 128
+    
+    # Age after which a disk cache temp file is treated as abandoned
+    STALE_PART_SECONDS = 60
+    
     def __init__(self, api_key: Optional[str] = None, voice_id: Optional[str] = None, language: Optional[str] = None):
         self.api_key = api_key or os.getenv("ELEVEN_LABS_API_KEY")
         
@@ -34,13 +141,25 @@ class ElevenLabsSpeech:
             raise ValueError("ElevenLabs API key is required. Set ELEVEN_LABS_API_KEY environment variable.")
         
         # Initialize pygame mixer for audio playback
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        _init_mixer()
+        
+        # Recently synthesized audio keyed by a hash of the request, least recent first
+        self._audio_cache: OrderedDict = OrderedDict()
         
-        # Create temp directory for audio files
-        self.temp_dir = Path(tempfile.gettempdir()) / "browser_agent_speech"
-        self.temp_dir.mkdir(exist_ok=True)
+        # In-flight audio requests by cache key
+        self._audio_tasks: dict = {}
+        
+        # Synthesized audio kept across runs, so repeated phrases skip the API entirely
+        self.cache_dir = Path(tempfile.gettempdir()) / "browser_agent_speech"
+        self.cache_dir.mkdir(exist_ok=True)
+        
+        # One thread for pygame mixer calls, keeping them serialized and off the event loop
+        self._mixer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mixer')
+        
+        # Pooled HTTP session, so TCP/TLS setup to ElevenLabs is paid once
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
         
-        logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
     async def speak(self, text: str, voice_settings: Optional[dict] = None) -> bool:
@@ -54,49 +173,171 @@ class ElevenLabsSpeech:
         Returns:
             bool: True if successful, False otherwise
         """
+        return await self.speak_fragments((text,), voice_settings)
+
+    async def speak_fragments(self, fragments: Sequence[str], voice_settings: Optional[dict] = None) -> bool:
+        """
+        Speak several pieces of text in order, starting playback as soon as
+        the first sentence is synthesized
+        
+        Args:
+            fragments: Texts to speak, in order
+            voice_settings: Optional voice configuration
+            
+        Returns:
+            bool: True if any fragment was played
+        """
+        settings = self._voice_settings(voice_settings)
+        
+        # Synthesize every sentence concurrently; later ones finish while earlier ones play
+        tasks = [asyncio.create_task(self._get_audio(sentence, settings)) for sentence in _split_sentences(fragments)]
+        spoke = False
         try:
-            # Default voice settings for natural speech
-            default_settings = {
-                "stability": 0.75,      # More stable = less variation
-                "similarity_boost": 0.8, # Higher = more like original voice
-                "style": 0.2,           # Lower = more natural, less dramatic  
-                "use_speaker_boost": True
-            }
+            for task in tasks:
+                audio_data = await task
+                if audio_data:
+                    spoke = await self._play_audio(audio_data) or spoke
+        except Exception as e:
+            self.logger.error(f"Speech generation failed: {e}")
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        return spoke
+
+    async def prewarm(self, phrases: Sequence[str], voice_settings: Optional[dict] = None):
+        """Synthesize phrases ahead of time so their first use plays from the cache"""
+        settings = self._voice_settings(voice_settings)
+        await asyncio.gather(*(self._get_audio(sentence, settings) for sentence in _split_sentences(phrases)))
+
+    def _voice_settings(self, voice_settings: Optional[dict] = None) -> dict:
+        """Merge voice settings over the defaults"""
+        # Default voice settings for natural speech
+        default_settings = {
+            "stability": 0.75,      # More stable = less variation
+            "similarity_boost": 0.8, # Higher = more like original voice
+            "style": 0.2,           # Lower = more natural, less dramatic  
+            "use_speaker_boost": True
+        }
+        
+        if voice_settings:
+            default_settings.update(voice_settings)
+        return default_settings
+
+    async def _get_audio(self, text: str, voice_settings: dict) -> Optional[bytes]:
+        """Generate audio, reusing it if this phrase was spoken recently or in an earlier run"""
+        cache_key = self._audio_cache_key(text, voice_settings)
+        audio_data = self._audio_cache.get(cache_key)
+        if audio_data:
+            self._audio_cache.move_to_end(cache_key)
+            return audio_data
+        
+        # Share one request between callers asking for the same audio at once (e.g. a
+        # prewarm still in flight); shield it so one caller giving up doesn't cancel it
+        task = self._audio_tasks.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._load_audio(text, voice_settings, cache_key))
+            self._audio_tasks[cache_key] = task
+            task.add_done_callback(lambda _: self._audio_tasks.pop(cache_key, None))
+        return await asyncio.shield(task)
+
+    async def _load_audio(self, text: str, voice_settings: dict, cache_key: str) -> Optional[bytes]:
+        """Load audio from the disk cache or ElevenLabs and remember it in memory"""
+        audio_data = await asyncio.to_thread(self._read_cached_audio, cache_key)
+        if not audio_data:
+            audio_data = await self._generate_audio(text, voice_settings)
+            if not audio_data:
+                return None
+            await asyncio.to_thread(self._write_cached_audio, cache_key, audio_data)
+        
+        self._audio_cache[cache_key] = audio_data
+        if len(self._audio_cache) > self.AUDIO_CACHE_SIZE:
+            self._audio_cache.popitem(last=False)
+        return audio_data
+
+    def _read_cached_audio(self, cache_key: str) -> Optional[bytes]:
+        """Read audio from the disk cache, marking it as recently used"""
+        cache_file = self.cache_dir / f"{cache_key}.mp3"
+        try:
+            audio_data = cache_file.read_bytes()
+            os.utime(cache_file)
+            return audio_data
+        except OSError:
+            return None
+
+    def _write_cached_audio(self, cache_key: str, audio_data: bytes):
+        """Save audio to the disk cache and evict the least recently used entries"""
+        cache_file = self.cache_dir / f"{cache_key}.mp3"
+        # Per-process temp name so two running instances can't interleave writes
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.part')
+        try:
+            tmp_file.write_bytes(audio_data)
+            os.replace(tmp_file, cache_file)
             
-            if voice_settings:
-                default_settings.update(voice_settings)
+            # Reads refresh mtime, so the oldest mtimes are the least recently used
+            entries = sorted(((path.stat(), path) for path in self.cache_dir.glob("*.mp3")),
+                             key=lambda entry: entry[0].st_mtime)
+            total = sum(stat.st_size for stat, _ in entries)
             
-            # Generate audio
-            audio_data = await self._generate_audio(text, default_settings)
-            if not audio_data:
-                return False
+            # Temp files count too; ones older than STALE_PART_SECONDS were left by a
+            # crashed writer and are always removed, newer ones may still be in use
+            stale_before = time.time() - self.STALE_PART_SECONDS
+            for path in self.cache_dir.glob("*.part"):
+                stat = path.stat()
+                if stat.st_mtime < stale_before:
+                    path.unlink(missing_ok=True)
+                else:
+                    total += stat.st_size
             
-            # Save and play audio
-            audio_file = await self._save_audio(audio_data)
-            if audio_file:
-                await self._play_audio(audio_file)
-                # Clean up temp file
-                try:
-                    os.unlink(audio_file)
-                except:
-                    pass
-                return True
-                
-        except Exception as e:
-            self.logger.error(f"Speech generation failed: {e}")
-            return False
+            for stat, path in entries:
+                if total <= _speech_config.disk_cache_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= stat.st_size
+        except OSError as e:
+            self.logger.debug(f"Could not cache audio: {e}")
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the pooled HTTP session, creating it on first use"""
+        import aiohttp
         
-        return False
+        # A session is bound to the event loop it was created on
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=60, ttl_dns_cache=300),
+                headers={"xi-api-key": self.api_key, "Accept": "audio/mpeg"}
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def warm_up(self):
+        """Open the pooled HTTP session with a cheap request so DNS, TCP and TLS are ready"""
+        import aiohttp
+        
+        try:
+            async with self._get_session().get(f"{self.base_url}/user") as response:
+                await response.read()
+                if response.status != 200:
+                    # Most often a wrong or expired API key; every later request will fail too
+                    self.logger.warning(f"ElevenLabs warm-up returned HTTP {response.status}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.warning(f"Speech warm-up failed: {e}")
+
+    async def close(self):
+        """Close the pooled HTTP session (call on the loop that used it)"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
 
     async def _generate_audio(self, text: str, voice_settings: dict) -> Optional[bytes]:
         """Generate audio using ElevenLabs API"""
-        url = f"{self.base_url}/text-to-speech/{self.voice_id}"
+        import aiohttp
         
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": self.api_key
-        }
+        # The streaming endpoint sends audio as it is generated, so the download
+        # overlaps synthesis instead of starting after it
+        url = f"{self.base_url}/text-to-speech/{self.voice_id}/stream"
         
         payload = {
             "text": text,
@@ -105,66 +346,115 @@ class ElevenLabsSpeech:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, headers=headers) as response:
-                    if response.status == 200:
-                        return await response.read()
-                    else:
-                        error_text = await response.text()
-                        self.logger.error(f"ElevenLabs API error {response.status}: {error_text}")
-                        return None
-        except Exception as e:
+            # Auth and Accept headers are session defaults; json= sets Content-Type
+            async with self._get_session().post(url, json=payload, params=self.STREAM_PARAMS) as response:
+                if response.status == 200:
+                    audio_data = bytearray()
+                    async for chunk in response.content.iter_chunked(16384):
+                        audio_data += chunk
+                    return bytes(audio_data)
+                else:
+                    error_text = await response.text()
+                    self.logger.error(f"ElevenLabs API error {response.status}: {error_text}")
+                    return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             self.logger.error(f"Network error generating audio: {e}")
             return None
 
-    async def _save_audio(self, audio_data: bytes) -> Optional[str]:
-        """Save audio data to temporary file"""
-        try:
-            temp_file = self.temp_dir / f"speech_{asyncio.get_event_loop().time()}.mp3"
-            with open(temp_file, 'wb') as f:
-                f.write(audio_data)
-            return str(temp_file)
-        except Exception as e:
-            self.logger.error(f"Failed to save audio: {e}")
-            return None
+    def _audio_cache_key(self, text: str, voice_settings: dict) -> str:
+        """Stable key for everything that changes the synthesized audio"""
+        # Whitespace differences don't change the speech, so they shouldn't miss the cache
+        request = json.dumps([" ".join(text.split()), self.voice_id, voice_settings], sort_keys=True)
+        return hashlib.blake2b(request.encode('utf-8'), digest_size=16).hexdigest()
 
-    async def _play_audio(self, audio_file: str):
-        """Play audio file using pygame"""
+    @staticmethod
+    def _load_and_play(audio_data: bytes):
+        """Decode MP3 audio and start playing it (runs on the mixer thread)"""
+        import pygame
+        
+        sound = pygame.mixer.Sound(file=io.BytesIO(audio_data))
+        return sound, sound.play()
+
+    async def _play_audio(self, audio_data: bytes) -> bool:
+        """Play MP3 audio from memory using pygame"""
+        import pygame
+        
         try:
-            pygame.mixer.music.load(audio_file)
-            pygame.mixer.music.play()
+            # Decoding blocks, so do it off the loop where later sentences are still downloading
+            sound, channel = await asyncio.get_running_loop().run_in_executor(
+                self._mixer_executor, self._load_and_play, audio_data
+            )
+            if channel is None:
+                return False
             
-            # Wait for playback to complete
-            while pygame.mixer.music.get_busy():
-                await asyncio.sleep(0.1)
+            # Sleep for the clip's known length instead of polling throughout,
+            # then check briefly for any remaining tail
+            await asyncio.sleep(sound.get_length())
+            while channel.get_busy():
+                await asyncio.sleep(0.01)
+            return True
                 
-        except Exception as e:
+        except (pygame.error, OSError) as e:
             self.logger.error(f"Failed to play audio: {e}")
+            return False
 
     def set_voice(self, voice_id: str):
         """Change the voice used for speech"""
         self.voice_id = voice_id
 
-    def get_available_voices(self):
+    def get_available_voices(self) -> Mapping[str, str]:
         """Return some popular ElevenLabs voice IDs with descriptions"""
-        return {
-            "21m00Tcm4TlvDq8ikWAM": "Rachel - Pleasant female, clear",
-            "AZnzlk1XvdvUeBnXmlld": "Domi - Confident female, strong", 
-            "EXAVITQu4vr4xnSDxMaL": "Bella - Soft female, gentle",
-            "ErXwobaYiN019PkySvjV": "Antoni - Calm male, professional",
-            "VR6AewLTigWG4xSOukaG": "Arnold - Deep male, authoritative",
-            "pNInz6obpgDQGcFmaJgB": "Adam - Friendly male, casual",
-            "yoZ06aMxZJJ28mfd3POQ": "Sam - Natural male, conversational"
-        }
+        return self._VOICES
+
 
+# Optional faster-whisper model, set once it has loaded in the background
+_local_recognizer = None
+_local_recognizer_loading = False
+_local_recognizer_lock = threading.Lock()
+
+def _load_local_recognizer():
+    """Load the faster-whisper model named by B4A_WHISPER_MODEL; Google's web API is used until (or unless) it loads"""
+    global _local_recognizer
+    
+    # Opt-in: CPU Whisper can be slower than Google on modest machines
+    model_name = os.getenv("B4A_WHISPER_MODEL")
+    if not model_name:
+        return
+    
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        logging.getLogger(__name__).warning("B4A_WHISPER_MODEL is set but faster-whisper is not installed; using Google")
+        return
+    
+    try:
+        # int8 on the CPU needs half the memory bandwidth of float32 for near-identical accuracy
+        _local_recognizer = WhisperModel(model_name, device="cpu", compute_type="int8")
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Local speech recognition unavailable, using Google: {e}")
+
+def _start_loading_local_recognizer():
+    """Load the local model on a daemon thread, once, so a first-run download never stalls a prompt"""
+    global _local_recognizer_loading
+    
+    with _local_recognizer_lock:
+        if _local_recognizer_loading:
+            return
+        _local_recognizer_loading = True
+    threading.Thread(target=_load_local_recognizer, name="whisper-load", daemon=True).start()
 
 class SpeechRecognizer:
     """Speech recognition using Google's Web Speech API"""
     
+    # Seconds between ambient noise re-calibrations; the dynamic energy
+    # threshold keeps adapting while listening in between
+    CALIBRATION_INTERVAL = 30
+    
     def __init__(self, language: Optional[str] = None):
         self.recognizer = sr.Recognizer()
         self.microphone = None
         self.is_listening = False
+        self._last_calibration = 0.0
         self.logger = logging.getLogger(__name__)
         
         # Get language configuration
@@ -178,20 +468,31 @@ class SpeechRecognizer:
         # Initialize microphone
         self._init_microphone()
         
+        # Load the optional local recognizer in the background
+        _start_loading_local_recognizer()
+        
         # Recognition settings
         self.recognition_timeout = 30  # seconds to wait for speech
-        self.phrase_timeout = 10  # seconds of silence to end phrase
+        self.phrase_timeout = 10  # longest phrase to record, in seconds
+        
+        # End a phrase after 0.5 s of silence instead of sr's default 0.8 s,
+        # keeping only as much leading silence as that allows
+        self.recognizer.pause_threshold = 0.5
+        self.recognizer.non_speaking_duration = 0.3
         
     def _init_microphone(self):
         """Initialize the microphone with error handling"""
         try:
-            # Get default microphone
-            self.microphone = sr.Microphone()
+            # Use the microphone chosen with microphone_selector.py, or the system default
+            # SharedMicrophone reuses one PortAudio instance instead of re-initializing it per stream
+            from audio_devices import SharedMicrophone
+            self.microphone = SharedMicrophone(device_index=_microphone_config.get('device_index'))
             
             # Adjust for ambient noise
             with self.microphone as source:
                 print(get_text("ui.calibrating_mic"))
                 self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            self._last_calibration = time.monotonic()
                 
             print(get_text("ui.mic_initialized"))
             self.logger.info("Microphone initialized successfully")
@@ -200,13 +501,15 @@ class SpeechRecognizer:
             self.logger.error(f"Failed to initialize microphone: {e}")
             self.microphone = None
     
-    def listen_for_speech(self, prompt: str = None, debug_audio: bool = False) -> Optional[str]:
+    def listen_for_speech(self, prompt: str = None, debug_audio: bool = False, source=None) -> Optional[str]:
         """
         Listen for speech input and convert to text
         
         Args:
             prompt: Optional prompt to display to user
             debug_audio: If True, save and play back recorded audio for debugging
+            source: Already-open microphone stream to listen on instead of
+                opening the microphone
             
         Returns:
             Recognized text or None if recognition failed
@@ -216,22 +519,28 @@ class SpeechRecognizer:
             return None
             
         try:
-            # Re-calibrate microphone before each listening session to avoid cached audio issues
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            
-            if prompt:
-                print(f"🎤 {prompt}")
-            else:
-                print("🎤 Listening... (speak now)")
+            # Open the microphone once for calibration and listening, unless a stream was given
+            with (self.microphone if source is None else nullcontext(source)) as stream:
+                if source is not None:
+                    # A long-lived stream has buffered everything since the last listen,
+                    # including the prompt just spoken; start from live audio instead
+                    self._discard_buffered_audio(stream)
+                
+                if time.monotonic() - self._last_calibration > self.CALIBRATION_INTERVAL:
+                    # Re-calibrate occasionally in case the room got louder or quieter
+                    self.recognizer.adjust_for_ambient_noise(stream, duration=0.5)
+                    self._last_calibration = time.monotonic()
+                
+                if prompt:
+                    print(f"🎤 {prompt}")
+                else:
+                    print("🎤 Listening... (speak now)")
+                    
+                self.is_listening = True
                 
-            self.is_listening = True
-            
-            # Listen for audio with timeout - create fresh audio capture
-            with self.microphone as source:
                 # Clear any previous audio buffer and listen for fresh speech
                 audio = self.recognizer.listen(
-                    source, 
+                    stream, 
                     timeout=self.recognition_timeout,
                     phrase_time_limit=self.phrase_timeout
                 )
@@ -246,7 +555,7 @@ class SpeechRecognizer:
             # Recognize speech using Google's service with fresh request each time
             try:
                 # Force fresh recognition by ensuring no cached results
-                text = self.recognizer.recognize_google(audio, language=self.language_code, show_all=False)
+                text = self._recognize(audio)
                 if text and text.strip():
                     print(get_text("voice.recognized", text=text))
                     return text.strip()
@@ -275,6 +584,34 @@ class SpeechRecognizer:
         finally:
             self.is_listening = False
     
+    @staticmethod
+    def _discard_buffered_audio(source):
+        """Drop audio the open stream captured before now"""
+        available = source.stream.pyaudio_stream.get_read_available()
+        if available > 0:
+            source.stream.read(available)
+    
+    def _recognize(self, audio) -> str:
+        """Transcribe audio locally with faster-whisper once it has loaded, otherwise with Google"""
+        local_recognizer = _local_recognizer
+        if local_recognizer is not None:
+            import numpy as np  # installed with faster-whisper
+            
+            try:
+                # Whisper takes 16 kHz mono float samples and only the base language ('en' of 'en-US')
+                pcm = np.frombuffer(audio.get_raw_data(convert_rate=16000, convert_width=2), dtype=np.int16)
+                segments, _ = local_recognizer.transcribe(
+                    pcm.astype(np.float32) / 32768.0,
+                    language=self.language_code.split('-')[0],
+                    beam_size=1
+                )
+                # Segments are decoded lazily, so errors surface while joining
+                return "".join(segment.text for segment in segments)
+            except Exception as e:
+                self.logger.warning(f"Local speech recognition failed, using Google: {e}")
+        
+        return self.recognizer.recognize_google(audio, language=self.language_code, show_all=False)
+    
     def _debug_save_and_play_audio(self, audio_data):
         """
         Save recorded audio to file and play it back for debugging
@@ -287,9 +624,8 @@ class SpeechRecognizer:
             debug_dir = Path(tempfile.gettempdir()) / "browser_agent_debug_audio"
             debug_dir.mkdir(exist_ok=True)
             
-            # Generate unique filename
-            timestamp = int(time.time() * 1000)
-            audio_filename = debug_dir / f"recorded_audio_{timestamp}.wav"
+            # Generate unique filename (pid + ns counter can't collide like ms timestamps)
+            audio_filename = debug_dir / f"recorded_audio_{os.getpid()}_{time.monotonic_ns():x}.wav"
             
             # Save audio data as WAV file
             with open(audio_filename, "wb") as f:
@@ -298,32 +634,119 @@ class SpeechRecognizer:
             print(f"🔧 Debug: Recorded audio saved to {audio_filename}")
             print("🔊 Playing back what was recorded...")
             
-            # Play back the recorded audio
+            # Play back the recorded audio on the shared mixer, replacing any earlier clip
+            import pygame
+            _init_mixer()
+            pygame.mixer.music.stop()
             pygame.mixer.music.load(str(audio_filename))
             pygame.mixer.music.play()
             
-            # Wait for playback to complete
+            # Wait for the recording's known length, then check briefly for any remaining tail
+            time.sleep(len(audio_data.frame_data) / (audio_data.sample_rate * audio_data.sample_width))
             while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
+                time.sleep(0.01)
             
             print("✅ Debug: Playback complete")
             
-            # Clean up the debug file after a short delay
-            try:
-                time.sleep(0.5)  # Brief delay to ensure file isn't locked
+            # Release the file (instead of waiting for the lock to clear) and clean it up
+            pygame.mixer.music.unload()
+            with suppress(OSError):  # Don't worry if cleanup fails
                 os.unlink(audio_filename)
-            except:
-                pass  # Don't worry if cleanup fails
                 
         except Exception as e:
             self.logger.error(f"Debug audio playback failed: {e}")
             print("⚠️ Debug audio playback failed, but speech recognition will continue")
     
+    def reset(self):
+        """Replace the recognizer, keeping its calibrated energy threshold and phrase settings"""
+        recognizer = sr.Recognizer()
+        recognizer.energy_threshold = self.recognizer.energy_threshold
+        recognizer.pause_threshold = self.recognizer.pause_threshold
+        recognizer.non_speaking_duration = self.recognizer.non_speaking_duration
+        self.recognizer = recognizer
+    
     def is_available(self) -> bool:
         """Check if speech recognition is available"""
         return self.microphone is not None
 
 
+class VoiceInputPrefetcher:
+    """
+    Long-lived background recognizer that keeps one microphone stream open
+    
+    Listen requests are served on the open stream instead of reopening and
+    re-calibrating the microphone for every prompt. Recognized utterances are
+    delivered through an asyncio.Queue.
+    """
+    
+    def __init__(self, recognizer: SpeechRecognizer):
+        self.recognizer = recognizer
+        self.results: Optional[asyncio.Queue] = None
+        self._requests = queue.SimpleQueue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+    
+    # Seconds stop() waits for an in-progress listen before leaving the daemon thread behind
+    STOP_TIMEOUT = 2
+    
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start the background recognizer (call from the running event loop)"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self.results = asyncio.Queue()
+        
+        # A daemon thread of its own, not the default executor: asyncio.Runner joins
+        # that at shutdown, which would hang on a thread waiting for requests
+        self._thread = threading.Thread(target=self._run, name="voice-prefetcher", daemon=True)
+        self._thread.start()
+    
+    def _deliver(self, text: Optional[str]):
+        """Hand a result to the event loop, unless it has already closed"""
+        with suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(self.results.put_nowait, text)
+    
+    def _run(self):
+        """Serve listen requests on a single open microphone stream"""
+        try:
+            with self.recognizer.microphone as source:
+                while True:
+                    request = self._requests.get()
+                    if request is None:
+                        break
+                    
+                    prompt, debug_audio = request
+                    text = self.recognizer.listen_for_speech(prompt, debug_audio, source=source)
+                    self._deliver(text)
+        except Exception as e:
+            self.logger.error(f"Voice input prefetcher stopped: {e}")
+            # Don't leave a pending request waiting forever
+            self._deliver(None)
+    
+    async def get(self, prompt: str = None, debug_audio: bool = False) -> Optional[str]:
+        """Request one utterance and wait for its recognized text"""
+        self._requests.put((prompt, debug_audio))
+        return await self.results.get()
+    
+    def listen(self, prompt: str = None, debug_audio: bool = False) -> Optional[str]:
+        """Blocking version of get() for worker threads"""
+        if threading.get_ident() == self._loop_thread_id:
+            raise RuntimeError("listen() would block the event loop; use 'await get()' instead")
+        return asyncio.run_coroutine_threadsafe(self.get(prompt, debug_audio), self._loop).result()
+    
+    async def stop(self):
+        """Stop the background recognizer, waiting briefly for any in-progress listen"""
+        self._requests.put(None)
+        deadline = time.monotonic() + self.STOP_TIMEOUT
+        while self.is_running and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+
 class SpeechConfig:
     """Configuration for speech settings"""
     
@@ -339,6 +762,7 @@ class SpeechConfig:
         self.speak_questions = True
         self.speak_confirmations = True
         self.speak_errors = False  # Usually don't speak errors
+        self.disk_cache_bytes = 64 * 1024 * 1024  # Synthesized audio kept on disk between runs
         
         # Speech-to-text settings
         self.listen_for_responses = True  # Enable voice input
@@ -376,9 +800,15 @@ class SpeechConfig:
         self.debug_audio = False
 
 
+# Spoken phrases that switch voice-first input over to typing
+_TEXT_INPUT_PHRASES = frozenset({'use text input', 'text input', 'type', 'typing', 'keyboard'})
+
 # Global speech instances - will be initialized when needed
 _speech_instance: Optional[ElevenLabsSpeech] = None
 _speech_recognizer: Optional[SpeechRecognizer] = None
+_voice_prefetcher: Optional[VoiceInputPrefetcher] = None
+_speech_loop: Optional[asyncio.AbstractEventLoop] = None
+_speech_loop_lock = threading.Lock()
 _speech_config = SpeechConfig()
 
 def get_speech_instance() -> Optional[ElevenLabsSpeech]:
@@ -391,9 +821,10 @@ def get_speech_instance() -> Optional[ElevenLabsSpeech]:
     if _speech_instance is None:
         try:
             _speech_instance = ElevenLabsSpeech(voice_id=_speech_config.voice_id)
-        except ValueError as e:
+        except Exception as e:  # missing API key, no audio device, pygame not installed
             logging.warning(f"Speech disabled: {e}")
             return None
+        atexit.register(_close_speech_at_exit)
     
     return _speech_instance
 
@@ -416,14 +847,72 @@ def get_speech_recognizer() -> Optional[SpeechRecognizer]:
 def reset_speech_recognizer():
     """Reset the speech recognizer to ensure fresh recognition"""
     global _speech_recognizer
-    _speech_recognizer = None
+    
+    # Keep a working microphone and its calibration; only retry one that failed
+    if _speech_recognizer and _speech_recognizer.is_available():
+        _speech_recognizer.reset()
+    else:
+        _speech_recognizer = None
+
+async def start_voice_prefetcher() -> Optional[VoiceInputPrefetcher]:
+    """Start the shared background voice recognizer used by get_user_input_with_voice"""
+    global _voice_prefetcher
+    
+    if _voice_prefetcher and _voice_prefetcher.is_running:
+        return _voice_prefetcher
+    if not _speech_config.offer_voice_input:
+        return None
+    
+    # Creating the recognizer calibrates the microphone; keep that off the loop
+    recognizer = await asyncio.to_thread(get_speech_recognizer)
+    if not recognizer or not recognizer.is_available():
+        return None
+    
+    _voice_prefetcher = VoiceInputPrefetcher(recognizer)
+    _voice_prefetcher.start()
+    return _voice_prefetcher
 
-async def speak_text(text: str, force: bool = False) -> bool:
+async def stop_voice_prefetcher():
+    """Stop the shared background voice recognizer, if running"""
+    global _voice_prefetcher
+    
+    if _voice_prefetcher:
+        await _voice_prefetcher.stop()
+        _voice_prefetcher = None
+
+def will_listen_for_voice() -> bool:
+    """Whether get_user_input_with_voice will use the microphone"""
+    return _speech_config.listen_for_responses and _speech_config.offer_voice_input
+
+def _listen(recognizer: SpeechRecognizer, prompt: str) -> Optional[str]:
+    """Listen through the running prefetcher if there is one, otherwise directly"""
+    if _voice_prefetcher and _voice_prefetcher.is_running:
+        return _voice_prefetcher.listen(prompt, _speech_config.debug_audio)
+    return recognizer.listen_for_speech(prompt, debug_audio=_speech_config.debug_audio)
+
+def _get_speech_loop() -> asyncio.AbstractEventLoop:
+    """Get the long-lived event loop that all speech runs on, starting it on first use"""
+    global _speech_loop
+    
+    with _speech_loop_lock:
+        if _speech_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="speech-loop", daemon=True).start()
+            _speech_loop = loop
+            atexit.register(_stop_speech_loop)
+    return _speech_loop
+
+def _stop_speech_loop():
+    """Stop the speech loop at exit (registered before, so runs after, _close_speech_at_exit)"""
+    if _speech_loop and _speech_loop.is_running():
+        _speech_loop.call_soon_threadsafe(_speech_loop.stop)
+
+async def speak_text(text: Union[str, Sequence[str]], force: bool = False) -> bool:
     """
     Speak text using ElevenLabs
     
     Args:
-        text: Text to speak
+        text: Text to speak, or a sequence of fragments to stream in order
         force: Speak even if speech is disabled
         
     Returns:
@@ -431,19 +920,27 @@ async def speak_text(text: str, force: bool = False) -> bool:
     """
     if not force and not _speech_config.enabled:
         return False
-        
+    
+    # Run on the speech loop, where the pooled HTTP session lives
+    speech_loop = _get_speech_loop()
+    if asyncio.get_running_loop() is not speech_loop:
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(speak_text(text, force), speech_loop))
+    
     speech = get_speech_instance()
-    if speech:
+    if not speech:
+        return False
+    if isinstance(text, str):
         return await speech.speak(text, _speech_config.voice_settings)
-    
-    return False
+    return await speech.speak_fragments(text, _speech_config.voice_settings)
 
-def speak_text_sync(text: str, force: bool = False) -> bool:
+def speak_text_sync(text: Union[str, Sequence[str]], force: bool = False) -> bool:
     """
     Synchronous version of speak_text that can be called from non-async contexts
     
+    Blocks the calling thread until the text has been spoken.
+    
     Args:
-        text: Text to speak
+        text: Text to speak, or a sequence of fragments to stream in order
         force: Speak even if speech is disabled
         
     Returns:
@@ -451,36 +948,43 @@ def speak_text_sync(text: str, force: bool = False) -> bool:
     """
     if not force and not _speech_config.enabled:
         return False
-        
+    
     try:
-        # Try to get existing event loop
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is running, we need to create a new task
-            # But since we're in sync context, we'll skip speech to avoid blocking
-            print("⚠️ Speech skipped - in async context")
-            return False
-        else:
-            # Loop exists but not running, we can use it
-            return loop.run_until_complete(_async_speak_text(text, force))
-    except RuntimeError:
-        # No event loop exists, create a new one
-        try:
-            return asyncio.run(_async_speak_text(text, force))
-        except Exception as e:
-            logging.warning(f"Speech failed: {e}")
-            return False
-
-async def _async_speak_text(text: str, force: bool = False) -> bool:
-    """Internal async version of speak_text"""
-    if not force and not _speech_config.enabled:
+        return asyncio.run_coroutine_threadsafe(speak_text(text, force), _get_speech_loop()).result()
+    except Exception as e:
+        logging.warning(f"Speech failed: {e}")
         return False
-        
+
+async def _warm_up_speech():
+    """Create the speech instance, warm up its connection and prewarm fixed phrases (runs on the speech loop)"""
     speech = get_speech_instance()
     if speech:
-        return await speech.speak(text, _speech_config.voice_settings)
-    
-    return False
+        await speech.warm_up()
+        await speech.prewarm([get_text(key) for key in _PREWARM_TEXT_KEYS], _speech_config.voice_settings)
+
+def warm_up_speech():
+    """Start connecting to ElevenLabs in the background so the first utterance skips setup"""
+    if _speech_config.enabled:
+        future = asyncio.run_coroutine_threadsafe(_warm_up_speech(), _get_speech_loop())
+        future.add_done_callback(_log_warm_up_failure)
+
+def _log_warm_up_failure(future):
+    """Log an unexpected warm-up error, which would otherwise vanish with the discarded future"""
+    if not future.cancelled() and future.exception():
+        logging.warning(f"Speech warm-up failed: {future.exception()!r}")
+
+def _close_speech_at_exit():
+    """Close the pooled HTTP session on the speech loop before the interpreter exits"""
+    if _speech_instance and _speech_loop and _speech_loop.is_running():
+        try:
+            asyncio.run_coroutine_threadsafe(_speech_instance.close(), _speech_loop).result(timeout=2)
+        except Exception:
+            pass
+
+async def close_speech():
+    """Close the speech instance's HTTP session on the speech loop"""
+    if _speech_instance and _speech_loop:
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_speech_instance.close(), _speech_loop))
 
 def get_user_input_with_voice(prompt: str = "Your response: ", voice_prompt: str = None) -> str:
     """
@@ -502,14 +1006,14 @@ def get_user_input_with_voice(prompt: str = "Your response: ", voice_prompt: str
             print(f"\n💬 🎤 Listening for your response... (say 'use text input' to switch to typing)")
             
             # Try voice input first (default mode)
-            voice_text = recognizer.listen_for_speech(
-                voice_prompt or "Please speak your response:",
-                debug_audio=_speech_config.debug_audio
+            voice_text = _listen(
+                recognizer,
+                voice_prompt or "Please speak your response:"
             )
             
             if voice_text:
                 # Check if user requested text input mode
-                if voice_text.lower() in ['use text input', 'text input', 'type', 'typing', 'keyboard']:
+                if voice_text.lower() in _TEXT_INPUT_PHRASES:
                     print("\n⌨️ Switching to text input:")
                     return input(prompt).strip()
                 else:
@@ -524,9 +1028,9 @@ def get_user_input_with_voice(prompt: str = "Your response: ", voice_prompt: str
                 
                 if not fallback_choice:  # Pressed Enter - try voice again
                     print("🎤 Trying voice input again...")
-                    voice_text_retry = recognizer.listen_for_speech(
-                        voice_prompt or "Please speak your response (second attempt):",
-                        debug_audio=_speech_config.debug_audio
+                    voice_text_retry = _listen(
+                        recognizer,
+                        voice_prompt or "Please speak your response (second attempt):"
                     )
                     if voice_text_retry:
                         return voice_text_retry
@@ -550,9 +1054,9 @@ def get_user_input_with_voice(prompt: str = "Your response: ", voice_prompt: str
                 print("🎤 Preparing to listen...")
                 
                 # Try voice input with debug audio if enabled
-                voice_text = recognizer.listen_for_speech(
-                    voice_prompt or "Please speak your response:",
-                    debug_audio=_speech_config.debug_audio
+                voice_text = _listen(
+                    recognizer,
+                    voice_prompt or "Please speak your response:"
                 )
                 
                 if voice_text:
@@ -585,6 +1089,8 @@ def configure_speech(**kwargs):
         _speech_config.speak_confirmations = kwargs['speak_confirmations']
     if 'speak_errors' in kwargs:
         _speech_config.speak_errors = kwargs['speak_errors']
+    if 'disk_cache_bytes' in kwargs:
+        _speech_config.disk_cache_bytes = kwargs['disk_cache_bytes']
     if 'listen_for_responses' in kwargs:
         _speech_config.listen_for_responses = kwargs['listen_for_responses']
     if 'offer_voice_input' in kwargs:
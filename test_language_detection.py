@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Test script for keyword-based language detection
+Run this with pytest or directly to check detect_text_language against known phrases.
+"""
+
+from language_utils import LanguageManager
+
+# Phrases whose keywords overlap between languages ('no' inside 'non', shared 'que')
+EXPECTED_LANGUAGES = {
+    'non merci': 'fr',
+    'Non, merci beaucoup': 'fr',
+    'oui, que faire': 'fr',
+    'hola, que tal': 'es',
+    'no gracias': 'es',
+    'nein danke': 'de',
+    '你好，谢谢': 'zh',
+}
+
+def test_overlapping_keywords():
+    """Each language is scored on its own keywords, so overlaps don't favour one language"""
+    manager = LanguageManager('en')
+    for text, expected in EXPECTED_LANGUAGES.items():
+        assert manager.detect_text_language(text) == expected, text
+
+def test_no_keywords_keeps_current_language():
+    """Text without any keywords falls back to the current language"""
+    assert LanguageManager('de').detect_text_language('hello there') == 'de'
+
+if __name__ == "__main__":
+    test_overlapping_keywords()
+    test_no_keywords_keeps_current_language()
+    print("✅ Language detection tests passed")